@@ -16,8 +16,11 @@ class Deque:
             self._next = next
 
     #---------------------- public methods -------------------------
-    def __init__(self):
-        """Create an empty list."""
+    def __init__(self, pool=None):
+        """Create an empty list, taking nodes from NodePool pool if given.
+        Nodes of a pooled deque are recycled once deleted, so callers must not
+        keep a node returned by _insert_between after deleting it."""
+        self._pool = pool
         self._header = self._Node(None, None, None)
         self._trailer = self._Node(None, None, None)
         self._header._next = self._trailer
@@ -52,6 +55,23 @@ class Deque:
         """Add an element to the back of the deque."""
         self._insert_between(e, self._trailer._prev, self._trailer)
 
+    def extend(self, elements):
+        """Add all elements of an iterable to the back of the deque, in order.
+        The new nodes are chained first and linked before the trailer in one step."""
+        last = self._trailer._prev
+        k = 0
+        for e in elements:
+            if self._pool is None:
+                node = self._Node(e, last, None)
+            else:
+                node = self._pool._acquire(e, last, None)
+            last._next = node
+            last = node
+            k += 1
+        last._next = self._trailer
+        self._trailer._prev = last
+        self._size += k
+
     def pop_head(self):
         """Remove and return the element from the front of the deque.
         Raise Empty exception if the deque is empty."""
@@ -69,11 +89,14 @@ class Deque:
     #----------------------- non public methods --------------------------
     def _insert_between(self, e, predecessor, sucessor):
         """Add element e between two existing nodes and return new node."""
-        newest = self._Node(e, predecessor, sucessor)
+        if self._pool is None:
+            newest = self._Node(e, predecessor, sucessor)
+        else:
+            newest = self._pool._acquire(e, predecessor, sucessor)
         predecessor._next = newest
         sucessor._prev = newest
         self._size += 1
-        return newest._element
+        return newest
 
     def _delete_node(self, node):
         """Delete nonsentinel node from the list and return its element."""
@@ -84,5 +107,51 @@ class Deque:
         self._size -= 1
         element = node._element
         node._prev = node._next = node._element = None
+        if self._pool is not None:
+            self._pool._release(node)
         return element
 
+
+class NodePool:
+    """Free list of recycled deque nodes, shareable by several Deques."""
+
+    def __init__(self, cap=1024):
+        """Create an empty pool keeping at most cap spare nodes."""
+        self._free = None               # spare nodes, linked through _next
+        self._count = 0
+        self._cap = cap
+        self._reused = self._allocated = self._released = self._dropped = 0
+
+    def __len__(self):
+        """Return the number of spare nodes in the pool."""
+        return self._count
+
+    def stats(self):
+        """Return a dict of pool counters."""
+        return {'spare': self._count, 'cap': self._cap, 'reused': self._reused,
+                'allocated': self._allocated, 'released': self._released, 'dropped': self._dropped}
+
+    def _acquire(self, element, prev, next):
+        """Return a node holding element, prev and next, recycled if one is spare."""
+        node = self._free
+        if node is None:
+            self._allocated += 1
+            return Deque._Node(element, prev, next)
+        self._free = node._next
+        self._count -= 1
+        self._reused += 1
+        node._element = element
+        node._prev = prev
+        node._next = next
+        return node
+
+    def _release(self, node):
+        """Take back a cleared node that is no longer linked into any deque."""
+        if self._count < self._cap:
+            node._next = self._free
+            self._free = node
+            self._count += 1
+            self._released += 1
+        else:
+            self._dropped += 1
+
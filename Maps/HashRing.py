@@ -0,0 +1,130 @@
+"""
+Consistent-hashing ring built on a sorted map.
+Each node is placed on a 64-bit ring at several virtual points (replicas times
+its weight), kept in a MapSorted.Map from point to node. A key belongs to the
+first point at or after its hash, wrapping around past the maximum, which is
+one find_gt (or find_min) on the sorted map.
+A change of membership reports the moved hash ranges as (start, stop, old, new)
+tuples: keys whose hash h satisfies start < h <= stop (wrapping around the ring
+when start >= stop) moved from node old to node new.
+Operation 					Running Time	(V = number of virtual points)
+------------------------------------------
+get_node 					O(log V)
+add_node, remove_node 		O(r V)		(r = points of the node, list inserts)
+assign_many 				O(m log m + V), plus the probing of bounded loads
+
+"""
+
+import MapSorted, hashlib, math
+
+class Ring:
+
+	#-------------------- public methods ---------------------------
+	def __init__(self, replicas=100):
+		"""Create an empty ring giving each unit of node weight replicas virtual points."""
+		self._points = MapSorted.Map()		# ring point -> node
+		self._nodes = {}					# node -> (weight, list of its ring points)
+		self._replicas = replicas
+
+	def __len__(self):
+		"""Return the number of nodes on the ring."""
+		return len(self._nodes)
+
+	def __contains__(self, node):
+		return node in self._nodes
+
+	def nodes(self):
+		"""Return a list of (node, weight) pairs."""
+		return [(node, self._nodes[node][0]) for node in self._nodes]
+
+	def get_node(self, key):
+		"""Return the node responsible for key (or None if the ring is empty)."""
+		return self._owner(self._hash_function(key))
+
+	def add_node(self, node, weight=1):
+		"""Place node on the ring with the given weight and return the moved ranges."""
+		if node in self._nodes:
+			raise ValueError('Node already on ring: ' + repr(node))
+		fresh = []
+		for i in range(max(1, int(round(self._replicas * weight)))):
+			p = self._hash_function('%s#%d' % (node, i))
+			if p not in self._points:		# a colliding point keeps its owner
+				fresh.append(p)
+		fresh.sort()
+		previous = [self._owner(p) for p in fresh]
+		for p in fresh:
+			self._points[p] = node
+		self._nodes[node] = (weight, fresh)
+		moves = []
+		for (p, old) in zip(fresh, previous):
+			if old is not None:
+				moves.append((self._predecessor(p), p, old, node))
+		return moves
+
+	def remove_node(self, node):
+		"""Take node off the ring and return the moved ranges.
+		The new owner is None if node was the last one."""
+		weight, points = self._nodes.pop(node)
+		starts = [self._predecessor(p) for p in points]
+		for p in points:
+			del self._points[p]
+		moves = []
+		for (start, p) in zip(starts, points):
+			moves.append((start, p, node, self._owner(p)))
+		return moves
+
+	def assign_many(self, keys, load_factor=None):
+		"""Return the list of nodes responsible for each key of keys.
+		Keys are hashed, sorted and swept against the ring in one merge. If
+		load_factor c (>= 1) is given, no node receives more than
+		ceil(c * len(keys) * weight / total weight) keys: a key whose node is
+		full moves on clockwise to the next node with room (bounded loads).
+		Raise ValueError if c < 1, as the nodes could not hold every key."""
+		if load_factor is not None and load_factor < 1:
+			raise ValueError('load_factor must be at least 1')
+		keys = list(keys)
+		result = [None] * len(keys)
+		ring = list(self._points.items())
+		if not ring or not keys:
+			return result
+		hashes = [self._hash_function(k) for k in keys]
+		order = sorted(range(len(keys)), key=hashes.__getitem__)
+		if load_factor is not None:
+			total = float(sum(self._nodes[node][0] for node in self._nodes))
+			room = {}
+			for node in self._nodes:
+				room[node] = int(math.ceil(load_factor * len(keys) * self._nodes[node][0] / total))
+		j = 0
+		for i in order:
+			while j < len(ring) and ring[j][0] < hashes[i]:
+				j += 1
+			if load_factor is None:
+				result[i] = ring[j % len(ring)][1]
+				continue
+			walk = j
+			while room[ring[walk % len(ring)][1]] == 0:
+				walk += 1
+			node = ring[walk % len(ring)][1]
+			room[node] -= 1
+			result[i] = node
+		return result
+
+
+	#------------------- nonpublic utilities -----------------------
+	def _hash_function(self, key):
+		"""Return a 64-bit ring position for key, stable across processes."""
+		return int(hashlib.md5(str(key).encode('utf-8')).hexdigest()[:16], 16)
+
+	def _owner(self, h):
+		"""Return the node of the first point at or after h, wrapping around."""
+		found = self._points.find_gt(h - 1)
+		if found is None:
+			found = self._points.find_min()
+		return found[1] if found is not None else None
+
+	def _predecessor(self, p):
+		"""Return the ring point before point p, wrapping around (p itself if alone)."""
+		found = self._points.find_lt(p)
+		if found is None:
+			found = self._points.find_max()
+		return found[0]
@@ -0,0 +1,209 @@
+"""
+Bounded cache map with LRU or LFU eviction.
+Keys are located through a MapHash.Map whose values are entries that know their
+own node in a DequeLinked.Deque, so a hit relinks its node and an eviction pops
+the front node, both in O(1).
+ - LRU: one deque orders the entries from least to most recently used.
+ - LFU: entries of equal use count share a deque (oldest first), and these
+   frequency deques are kept in a deque ordered by count, so the victim is
+   always at the front of the first one.
+The DequeLinked module (Deques/) must be importable alongside this one.
+Operation 					Running Time
+------------------------------------------
+getitem 					O(1) expected
+setitem 					O(1) expected, plus O(1) per eviction
+delitem 					O(1) expected
+len 						O(1)
+iter 						O(n)
+
+"""
+
+from collections import MutableMapping
+import MapHash, DequeLinked, functools
+
+class Map(MutableMapping):
+
+	#------------------- nested Entry classes ------------------------
+	class _Entry:
+		"""Cached key-value pair with its weight and its node in the order deque."""
+		__slots__ = '_key', '_value', '_weight', '_node', '_bucket'
+
+		def __init__(self, k, v, weight):
+			self._key = k
+			self._value = v
+			self._weight = weight
+			self._node = None
+			self._bucket = None			# frequency bucket (LFU only)
+
+	class _Bucket:
+		"""Deque of the entries used exactly freq times (LFU only)."""
+		__slots__ = '_freq', '_entries', '_node'
+
+		def __init__(self, freq):
+			self._freq = freq
+			self._entries = DequeLinked.Deque()
+			self._node = None
+
+	#-------------------- public methods ---------------------------
+	def __init__(self, maxsize=128, maxweight=None, policy='lru', weigher=None):
+		"""Create an empty cache holding at most maxsize items and maxweight total weight.
+		Either limit may be None. weigher(k, v) gives the weight of an item (1 by default).
+		policy is 'lru' (least recently used) or 'lfu' (least frequently used)."""
+		if policy not in ('lru', 'lfu'):
+			raise ValueError('policy must be lru or lfu')
+		self._map = MapHash.Map()
+		self._order = DequeLinked.Deque()	# entries (LRU) or frequency buckets (LFU)
+		self._lfu = policy == 'lfu'
+		self._maxsize = maxsize
+		self._maxweight = maxweight
+		self._weigher = weigher
+		self._weight = 0
+		self._hits = 0
+		self._misses = 0
+		self._evictions = 0
+
+	def __len__(self):
+		return len(self._map)
+
+	def __iter__(self):
+		return iter(self._map)
+
+	def __contains__(self, k):
+		"""Return True if k is cached, without counting a hit or refreshing k."""
+		return k in self._map
+
+	def __getitem__(self, k):
+		try:
+			entry = self._map[k]
+		except KeyError:
+			self._misses += 1
+			raise
+		self._hits += 1
+		self._touch(entry)
+		return entry._value
+
+	def __setitem__(self, k, v):
+		"""Cache v under k, evicting items as needed.
+		Raise ValueError (leaving the cache unchanged) if the item alone weighs more than maxweight."""
+		weight = self._weigher(k, v) if self._weigher is not None else 1
+		if self._maxweight is not None and weight > self._maxweight:
+			raise ValueError('Item weight ' + repr(weight) + ' exceeds maxweight')
+		if k in self._map:
+			entry = self._map[k]
+			self._weight += weight - entry._weight
+			entry._value = v
+			entry._weight = weight
+			self._touch(entry)
+			self._evict(0, 0)
+		else:
+			self._evict(1, weight)				# make room before the newcomer is linked
+			entry = self._Entry(k, v, weight)
+			self._map[k] = entry
+			self._weight += weight
+			self._link(entry)
+
+	def __delitem__(self, k):
+		entry = self._map[k]
+		del self._map[k]
+		self._unlink(entry)
+		self._weight -= entry._weight
+
+	def weight(self):
+		"""Return the total weight of the cached items."""
+		return self._weight
+
+	def stats(self):
+		"""Return a dictionary of hit, miss and eviction counters and current usage."""
+		return {'hits': self._hits, 'misses': self._misses, 'evictions': self._evictions,
+				'size': len(self), 'weight': self._weight}
+
+
+	#------------------- nonpublic ordering utilities ---------------
+	def _link(self, entry):
+		"""Place a new entry as the most recent (LRU) or in the count-1 bucket (LFU)."""
+		if not self._lfu:
+			entry._node = self._order._insert_between(entry, self._order._trailer._prev, self._order._trailer)
+			return
+		first = self._order._header._next
+		if first is self._order._trailer or first._element._freq != 1:
+			first = self._new_bucket(1, self._order._header, first)
+		self._add_to_bucket(entry, first._element)
+
+	def _unlink(self, entry):
+		"""Detach entry from the ordering structures."""
+		if not self._lfu:
+			self._order._delete_node(entry._node)
+			return
+		bucket = entry._bucket
+		bucket._entries._delete_node(entry._node)
+		if bucket._entries.is_empty():
+			self._order._delete_node(bucket._node)
+
+	def _touch(self, entry):
+		"""Record a use of entry."""
+		if not self._lfu:
+			self._order._delete_node(entry._node)
+			entry._node = self._order._insert_between(entry, self._order._trailer._prev, self._order._trailer)
+			return
+		bucket = entry._bucket
+		nxt = bucket._node._next
+		if nxt is self._order._trailer or nxt._element._freq != bucket._freq + 1:
+			nxt = self._new_bucket(bucket._freq + 1, bucket._node, nxt)
+		self._unlink(entry)
+		self._add_to_bucket(entry, nxt._element)
+
+	def _new_bucket(self, freq, predecessor, successor):
+		"""Create a frequency bucket between two nodes of the order deque and return its node."""
+		bucket = self._Bucket(freq)
+		bucket._node = self._order._insert_between(bucket, predecessor, successor)
+		return bucket._node
+
+	def _add_to_bucket(self, entry, bucket):
+		entries = bucket._entries
+		entry._bucket = bucket
+		entry._node = entries._insert_between(entry, entries._trailer._prev, entries._trailer)
+
+	def _victim(self):
+		"""Return the entry to evict next."""
+		first = self._order._header._next._element
+		if not self._lfu:
+			return first
+		return first._entries._header._next._element
+
+	def _evict(self, extra_items, extra_weight):
+		"""Evict entries until extra_items more items of extra_weight fit the limits."""
+		while len(self._map) > 0 and (
+				(self._maxsize is not None and len(self._map) + extra_items > self._maxsize) or
+				(self._maxweight is not None and self._weight + extra_weight > self._maxweight)):
+			victim = self._victim()
+			del self[victim._key]
+			self._evictions += 1
+
+
+#----------------------- memoization decorator -----------------------
+_KWMARK = object()		# separates positional from keyword arguments in cache keys
+
+def memoize(maxsize=128, maxweight=None, policy='lru', weigher=None):
+	"""Return a decorator caching a function's results in a Map keyed by its arguments.
+	Results heavier than maxweight are returned without being cached.
+	The cache of a decorated function is available as its cache attribute."""
+	def decorate(func):
+		cache = Map(maxsize, maxweight, policy, weigher)
+		def wrapper(*args, **kwargs):
+			key = args
+			if kwargs:
+				key += (_KWMARK,) + tuple(sorted(kwargs.items()))
+			try:
+				return cache[key]
+			except KeyError:
+				pass
+			result = func(*args, **kwargs)
+			try:
+				cache[key] = result
+			except ValueError:			# too heavy to cache
+				pass
+			return result
+		functools.update_wrapper(wrapper, func)
+		wrapper.cache = cache
+		return wrapper
+	return decorate
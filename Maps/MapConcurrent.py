@@ -0,0 +1,128 @@
+"""
+Thread-safe hash map that splits its key space across independent MapHash shards.
+Every shard is guarded by its own lock, so threads working on different shards
+never wait on each other, and a resize only stalls the shard that grows.
+Operation 					Running Time
+------------------------------------------
+getitem 					O(1) expected
+setitem 					O(1) expected
+delitem 					O(1) expected
+len 						O(s)	(s = number of shards)
+iter 						O(n)
+get_many, set_many 			O(k) expected, one lock per shard
+
+"""
+
+from collections import MutableMapping
+import MapHash, threading
+
+class Map(MutableMapping):
+
+	_MISSING = object()		# sentinel for absent keys inside batched lookups
+
+	#-------------------- public methods ---------------------------
+	def __init__(self, shards=16, cap=11):
+		"""Create an empty map split into the given number of shards."""
+		self._shards = [MapHash.Map(cap) for i in range(shards)]
+		self._locks = [threading.Lock() for i in range(shards)]
+
+	def __len__(self):
+		total = 0
+		for j in range(len(self._shards)):
+			with self._locks[j]:
+				total += len(self._shards[j])
+		return total
+
+	def __iter__(self):
+		"""Generate the keys of the map, shard by shard.
+		Each shard is copied under its lock, so concurrent writers are safe."""
+		for j in range(len(self._shards)):
+			with self._locks[j]:
+				keys = list(self._shards[j])
+			for k in keys:
+				yield k
+
+	def __getitem__(self, k):
+		j = self._shard_index(k)
+		with self._locks[j]:
+			return self._shards[j][k]
+
+	def __setitem__(self, k, v):
+		j = self._shard_index(k)
+		with self._locks[j]:
+			self._shards[j][k] = v
+
+	def __delitem__(self, k):
+		j = self._shard_index(k)
+		with self._locks[j]:
+			del self._shards[j][k]
+
+	def __contains__(self, k):
+		j = self._shard_index(k)
+		with self._locks[j]:
+			return k in self._shards[j]
+
+	def get(self, k, default=None):
+		"""Return the value for k if k is in the map, else default."""
+		j = self._shard_index(k)
+		with self._locks[j]:
+			return self._shards[j].get(k, default)
+
+	def pop(self, k, default=_MISSING):
+		"""Atomically remove k and return its value.
+		Return default if given and k is absent, otherwise raise KeyError."""
+		j = self._shard_index(k)
+		with self._locks[j]:
+			if default is Map._MISSING:
+				return self._shards[j].pop(k)
+			return self._shards[j].pop(k, default)
+
+	def setdefault(self, k, default=None):
+		"""Atomically return the value for k, inserting default if k is absent."""
+		j = self._shard_index(k)
+		with self._locks[j]:
+			return self._shards[j].setdefault(k, default)
+
+	def get_many(self, keys, default=None):
+		"""Return a list with the value of every key in keys (default if absent).
+		Each shard lock is taken once for the whole batch."""
+		keys = list(keys)
+		result = [default] * len(keys)
+		groups = self._group(range(len(keys)), keys)
+		for j in range(len(groups)):
+			if groups[j]:
+				shard = self._shards[j]
+				with self._locks[j]:
+					for i in groups[j]:
+						v = shard.get(keys[i], Map._MISSING)
+						if v is not Map._MISSING:
+							result[i] = v
+		return result
+
+	def set_many(self, items):
+		"""Assign every (k, v) pair of items (a mapping or an iterable of pairs).
+		Each shard lock is taken once for the whole batch."""
+		if hasattr(items, 'keys'):
+			items = [(k, items[k]) for k in items]
+		else:
+			items = list(items)
+		groups = self._group(items, [k for (k, v) in items])
+		for j in range(len(groups)):
+			if groups[j]:
+				shard = self._shards[j]
+				with self._locks[j]:
+					for (k, v) in groups[j]:
+						shard[k] = v
+
+
+	#------------------- nonpublic utilities -----------------------
+	def _shard_index(self, k):
+		"""Return the index of the shard responsible for key k."""
+		return hash(k) % len(self._shards)
+
+	def _group(self, entries, keys):
+		"""Split entries into per-shard lists, using the matching key of each entry."""
+		groups = [[] for j in range(len(self._shards))]
+		for (e, k) in zip(entries, keys):
+			groups[self._shard_index(k)].append(e)
+		return groups
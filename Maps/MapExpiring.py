@@ -0,0 +1,111 @@
+"""
+Hash map whose entries expire after a per-key time-to-live.
+Items live in a MapHash.Map; every deadline is also recorded in a
+PriorityQueueHeap.PriorityQueue, so expired keys are found by popping the
+due prefix of the heap instead of scanning the map. Expired entries are
+dropped lazily when accessed, or in bulk by expire_due.
+Heap records left behind by overwritten or deleted keys are recognised as
+stale and skipped; the heap is rebuilt once they outnumber the live entries.
+The PriorityQueueHeap module (Queues/) must be importable alongside this one.
+Operation 					Running Time
+------------------------------------------
+getitem 					O(1) expected
+setitem 					O(log n) expected
+delitem 					O(1) expected
+expire_due 					O((e + 1) log n)	(e = entries popped)
+len, iter 					O((e + 1) log n), O(n)
+
+"""
+
+from collections import MutableMapping
+import MapHash, PriorityQueueHeap, time
+
+class Map(MutableMapping):
+
+	#------------------- nested Entry class ------------------------
+	class _Entry:
+		"""Stored value together with its absolute deadline (None = never expires)."""
+		__slots__ = '_value', '_deadline'
+
+		def __init__(self, v, deadline):
+			self._value = v
+			self._deadline = deadline
+
+	#-------------------- public methods ---------------------------
+	def __init__(self, ttl=None, clock=time.time):
+		"""Create an empty map whose entries live ttl seconds by default (None = forever).
+		clock() must return the current time in seconds."""
+		self._map = MapHash.Map()
+		self._deadlines = PriorityQueueHeap.PriorityQueue()	# (deadline, key) records
+		self._ttl = ttl
+		self._clock = clock
+
+	def __len__(self):
+		self.expire_due()
+		return len(self._map)
+
+	def __iter__(self):
+		self.expire_due()
+		for k in list(self._map):
+			yield k
+
+	def __getitem__(self, k):
+		entry = self._map[k]
+		if entry._deadline is not None and entry._deadline <= self._clock():
+			del self._map[k]
+			raise KeyError('Key Error: ' + repr(k))
+		return entry._value
+
+	def __setitem__(self, k, v):
+		self.set(k, v)
+
+	def __delitem__(self, k):
+		del self._map[k]			# its heap record, if any, is now stale
+
+	def set(self, k, v, ttl=None):
+		"""Assign value v to key k, expiring after ttl seconds (default: the map's ttl)."""
+		if ttl is None:
+			ttl = self._ttl
+		deadline = self._clock() + ttl if ttl is not None else None
+		self._map[k] = self._Entry(v, deadline)
+		if deadline is not None:
+			self._deadlines.enqueue(deadline, k)
+			if len(self._deadlines) > 2 * len(self._map) + 16:
+				self._rebuild_heap()
+
+	def ttl(self, k):
+		"""Return the seconds left before k expires, or None if it never does.
+		Raise KeyError if k is absent or already expired."""
+		entry = self._map[k]
+		if entry._deadline is None:
+			return None
+		left = entry._deadline - self._clock()
+		if left <= 0:
+			del self._map[k]
+			raise KeyError('Key Error: ' + repr(k))
+		return left
+
+	def expire_due(self, now=None):
+		"""Remove every entry whose deadline is at or before now (default: the clock).
+		Only the due prefix of the deadline heap is popped. Return the number removed."""
+		if now is None:
+			now = self._clock()
+		removed = 0
+		while not self._deadlines.is_empty() and self._deadlines.peek()[0] <= now:
+			deadline, k = self._deadlines.dequeue()
+			entry = self._map.get(k)
+			if entry is not None and entry._deadline == deadline:
+				del self._map[k]
+				removed += 1
+		return removed
+
+
+	#------------------- nonpublic utilities -----------------------
+	def _rebuild_heap(self):
+		"""Rebuild the deadline heap from the live entries, dropping stale records."""
+		live = []
+		for k in self._map:
+			deadline = self._map[k]._deadline
+			if deadline is not None:
+				live.append((deadline, k))
+		self._deadlines = PriorityQueueHeap.PriorityQueue(live)
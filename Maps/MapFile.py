@@ -0,0 +1,276 @@
+"""
+Persistent hash map stored in a memory-mapped file.
+The file holds a fixed header, an open-addressing slot array (linear probing)
+and an append-only heap of key/value records. Opening an existing file only
+maps it and reads the header, and read-only maps share the page cache across
+processes. Keys must be str, bytes or integers (bools and integral floats
+count as the equal int) and are stored in a canonical byte form that equal
+keys share; values are stored pickled. Overwritten and deleted records stay in
+the heap as garbage until it outweighs the live records, when the file is
+compacted automatically.
+Operation 					Running Time
+------------------------------------------
+open 						O(1)
+getitem 					O(1) expected, O(n) worst
+setitem 					O(1) expected, O(n) worst
+delitem 					O(1) expected, O(n) worst
+len 						O(1)
+iter 						O(n)
+
+File layout
+-----------
+header		magic, capacity, live items, used slots, end of heap, garbage bytes
+slots		capacity * (key hash, record offset)
+heap		records of (key length, value length, key bytes, value bytes)
+
+"""
+
+from collections import MutableMapping
+import hashlib, mmap, os, pickle, struct
+
+class Map(MutableMapping):
+
+	_MAGIC = b'MAPFILE2'
+	_HEADER = struct.Struct('<8sQQQQQ')
+	_SLOT = struct.Struct('<QQ')
+	_RECORD = struct.Struct('<II')
+	_EMPTY = 0							# record offset of a never-used slot
+	_AVAIL = 1							# record offset of a deleted slot (tombstone)
+	_MIN_GARBAGE = 1 << 14				# never compact for less garbage than this
+
+	#-------------------- public methods ---------------------------
+	def __init__(self, path, cap=11, readonly=False):
+		"""Open the map stored at path, creating it with cap slots if missing.
+		A read-only map may be shared by several processes."""
+		self._path = path
+		self._readonly = readonly
+		if not os.path.exists(path):
+			if readonly:
+				raise IOError('No map file at ' + repr(path))
+			self._create(path, cap, 0)
+		self._open()
+
+	def __len__(self):
+		return self._n
+
+	def __iter__(self):
+		for j in range(self._cap):
+			h, off = self._read_slot(j)
+			if off > Map._AVAIL:
+				yield self._decode_key(self._record(off)[0])
+
+	def __getitem__(self, k):
+		kb = self._key_bytes(k)
+		j = self._find_slot(kb, None) if kb is not None else -1
+		if j < 0:
+			raise KeyError('Key Error: ' + repr(k))
+		return pickle.loads(self._record(self._read_slot(j)[1])[1])
+
+	def __setitem__(self, k, v):
+		self._check_writable()
+		kb = self._key_bytes(k)
+		if kb is None:
+			raise TypeError('map file keys must be str, bytes or int, not ' + type(k).__name__)
+		h = self._hash_function(kb)
+		j = self._find_slot(kb, h)
+		off = self._append_record(kb, pickle.dumps(v, 2))
+		if j >= 0:
+			self._garbage += self._record_size(self._read_slot(j)[1])
+			self._write_slot(j, h, off)			# old record becomes garbage
+		else:
+			j = -j - 1
+			if self._read_slot(j)[1] == Map._EMPTY:
+				self._used += 1
+			self._write_slot(j, h, off)
+			self._n += 1
+		self._write_header()
+		if self._used > self._cap // 2:
+			if self._n > self._cap // 4:
+				self._rebuild(2 * self._cap - 1)
+			else:
+				self._rebuild(self._cap)			# mostly tombstones: purge them
+		else:
+			self._compact_if_wasteful()
+
+	def __delitem__(self, k):
+		self._check_writable()
+		kb = self._key_bytes(k)
+		j = self._find_slot(kb, None) if kb is not None else -1
+		if j < 0:
+			raise KeyError('Key Error: ' + repr(k))
+		h, off = self._read_slot(j)
+		self._garbage += self._record_size(off)
+		self._write_slot(j, h, Map._AVAIL)
+		self._n -= 1
+		self._write_header()
+		self._compact_if_wasteful()
+
+	def flush(self):
+		"""Write all changes through to the file."""
+		self._mm.flush()
+
+	def compact(self):
+		"""Rewrite the file without tombstones and overwritten records."""
+		self._check_writable()
+		self._rebuild(self._cap)
+
+	def close(self):
+		"""Flush and release the file mapping; the map is unusable afterwards."""
+		if self._mm is not None:
+			if not self._readonly:
+				self._mm.flush()
+			self._mm.close()
+			self._file.close()
+			self._mm = self._file = None
+
+
+	#------------------- nonpublic file management ------------------
+	@staticmethod
+	def _create(path, cap, heap_size):
+		"""Write an empty map file with cap slots and room for heap_size bytes."""
+		heap_start = Map._HEADER.size + cap * Map._SLOT.size
+		with open(path, 'wb') as f:
+			f.write(Map._HEADER.pack(Map._MAGIC, cap, 0, 0, heap_start, 0))
+			f.truncate(heap_start + max(heap_size, 4096))
+
+	def _open(self):
+		"""Map the file and load its header."""
+		if self._readonly:
+			self._file = open(self._path, 'rb')
+			self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+		else:
+			self._file = open(self._path, 'r+b')
+			self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE)
+		magic, self._cap, self._n, self._used, self._heap_end, self._garbage = Map._HEADER.unpack_from(self._mm, 0)
+		if magic != Map._MAGIC:
+			self.close()
+			raise ValueError(repr(self._path) + ' is not a map file')
+
+	def _write_header(self):
+		Map._HEADER.pack_into(self._mm, 0, Map._MAGIC, self._cap, self._n, self._used, self._heap_end, self._garbage)
+
+	def _check_writable(self):
+		if self._readonly:
+			raise TypeError('Map is opened read-only')
+
+	def _compact_if_wasteful(self):
+		"""Compact once garbage records take more room than the live ones."""
+		live = self._heap_end - Map._HEADER.size - self._cap * Map._SLOT.size - self._garbage
+		if self._garbage > max(live, Map._MIN_GARBAGE):
+			self._rebuild(self._cap)
+
+	def _grow(self, need):
+		"""Extend the file so that need more heap bytes fit after the heap end."""
+		size = max(2 * len(self._mm), self._heap_end + need)
+		self._mm.flush()
+		self._mm.close()
+		self._file.truncate(size)
+		self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE)
+
+	def _rebuild(self, c):
+		"""Copy the live records into a fresh file with c slots and swap it in."""
+		live = []
+		size = 0
+		for j in range(self._cap):
+			h, off = self._read_slot(j)
+			if off > Map._AVAIL:
+				kb, vb = self._record(off)
+				live.append((h, kb, vb))
+				size += Map._RECORD.size + len(kb) + len(vb)
+		tmp = self._path + '.tmp'
+		Map._create(tmp, c, size)
+		fresh = Map(tmp)
+		for (h, kb, vb) in live:
+			j = -fresh._find_slot(kb, h) - 1
+			fresh._write_slot(j, h, fresh._append_record(kb, vb))
+		fresh._n = fresh._used = len(live)
+		fresh._write_header()
+		fresh.close()
+		self.close()
+		os.replace(tmp, self._path)
+		self._open()
+
+
+	#------------------- nonpublic slot and record access ------------
+	@staticmethod
+	def _key_bytes(k):
+		"""Return the canonical bytes of key k, equal for equal keys, or None if
+		k is not a str, bytes or integral number."""
+		if isinstance(k, str):
+			return b's' + k.encode('utf-8', 'surrogatepass')
+		if isinstance(k, bytes):
+			return b'b' + k
+		if isinstance(k, float) and k.is_integer():
+			k = int(k)
+		if isinstance(k, int):
+			return b'i' + int(k).to_bytes(k.bit_length() // 8 + 1, 'little', signed=True)
+		return None
+
+	@staticmethod
+	def _decode_key(kb):
+		"""Return the key whose canonical bytes are kb."""
+		kind, body = kb[:1], kb[1:]
+		if kind == b's':
+			return body.decode('utf-8', 'surrogatepass')
+		if kind == b'b':
+			return bytes(body)
+		return int.from_bytes(body, 'little', signed=True)
+
+	def _hash_function(self, kb):
+		"""Return a 64-bit hash of key bytes kb that is stable across processes."""
+		return int.from_bytes(hashlib.blake2b(kb, digest_size=8).digest(), 'little')
+
+	def _read_slot(self, j):
+		return Map._SLOT.unpack_from(self._mm, Map._HEADER.size + j * Map._SLOT.size)
+
+	def _write_slot(self, j, h, off):
+		Map._SLOT.pack_into(self._mm, Map._HEADER.size + j * Map._SLOT.size, h, off)
+
+	def _record(self, off):
+		"""Return the (key bytes, value bytes) of the record at offset off."""
+		klen, vlen = Map._RECORD.unpack_from(self._mm, off)
+		start = off + Map._RECORD.size
+		return self._mm[start:start + klen], self._mm[start + klen:start + klen + vlen]
+
+	def _record_size(self, off):
+		klen, vlen = Map._RECORD.unpack_from(self._mm, off)
+		return Map._RECORD.size + klen + vlen
+
+	def _append_record(self, kb, vb):
+		"""Append a record to the heap and return its offset."""
+		need = Map._RECORD.size + len(kb) + len(vb)
+		if self._heap_end + need > len(self._mm):
+			self._grow(need)
+		off = self._heap_end
+		Map._RECORD.pack_into(self._mm, off, len(kb), len(vb))
+		start = off + Map._RECORD.size
+		self._mm[start:start + len(kb)] = kb
+		self._mm[start + len(kb):start + need - Map._RECORD.size] = vb
+		self._heap_end += need
+		return off
+
+	def _find_slot(self, kb, h):
+		"""Search for key bytes kb (with hash h, computed if None).
+		Return its slot index j >= 0 if found, otherwise -(f + 1) where f is
+		the first available slot met along the probe sequence."""
+		if h is None:
+			h = self._hash_function(kb)
+		j = h % self._cap
+		first_avail = None
+		while True:
+			stored, off = self._read_slot(j)
+			if off == Map._EMPTY:
+				if first_avail is None:
+					first_avail = j
+				return -first_avail - 1
+			if off == Map._AVAIL:
+				if first_avail is None:
+					first_avail = j
+			elif stored == h and self._record_key(off) == kb:
+				return j
+			j = (j + 1) % self._cap
+
+	def _record_key(self, off):
+		klen = Map._RECORD.unpack_from(self._mm, off)[0]
+		start = off + Map._RECORD.size
+		return self._mm[start:start + klen]
@@ -0,0 +1,208 @@
+"""
+Immutable map indexed by a minimal perfect hash (CHD: compress, hash and displace).
+The n keys are hashed into about n/2 buckets; each bucket gets a displacement
+that sends its keys to distinct free slots of an n-slot table, largest buckets
+first. A lookup therefore reads one displacement and probes exactly one slot,
+and the table has no empty slots and no collisions.
+Keys must be str, bytes or integers (bools and integral floats count as the
+equal int, as in MapFile). A str is hashed with crc32 and crc16 of its UTF-8
+bytes and a 64-bit int with the same over its 8 bytes, so a lookup costs two
+C calls on small integers and the hashes are stable across processes: a frozen
+map can be saved with to_bytes and loaded elsewhere with from_bytes.
+Operation 					Running Time
+------------------------------------------
+build (freeze) 				O(n) expected
+getitem 					O(1) worst, one probe
+len 						O(1)
+iter 						O(n)
+from_bytes 					O(n) unpickling, no rehashing
+
+"""
+
+from collections import Mapping
+from array import array
+import MapFile
+import binascii, pickle, struct, sys, zlib
+
+_crc32, _crc16 = zlib.crc32, binascii.crc_hqx
+_INT_SALT = 0x5A5A						# keeps int keys apart from 8-byte strings
+_INT_MIN, _INT_MAX = -(1 << 63), (1 << 63) - 1
+_pack_int = struct.Struct('<q').pack
+
+class Map(Mapping):
+
+	_MAGIC = b'MAPCHD03'
+	_HEADER = struct.Struct('<8sQQQ')		# magic, items, buckets, seed
+	_MAX_SEEDS = 32
+
+	#-------------------- public methods ---------------------------
+	def __init__(self, items=()):
+		"""Build a frozen map from a mapping or an iterable of (k, v) pairs."""
+		if hasattr(items, 'keys'):
+			source = items
+			items = [(k, source[k]) for k in source]
+		pairs = {}
+		for (k, v) in items:
+			pairs[k] = v
+		self._build(list(pairs.keys()), list(pairs.values()))
+
+	def __len__(self):
+		return len(self._keys)
+
+	def __iter__(self):
+		return iter(self._keys)
+
+	def __getitem__(self, k):
+		if type(k) is str:					# _hash_function, inlined for str and int keys
+			c = k.encode('utf-8', 'surrogatepass')
+			h1 = _crc32(c, self._s1)
+			h2 = _crc16(c, self._s2)
+		elif type(k) is int and _INT_MIN <= k <= _INT_MAX:
+			c = _pack_int(k)
+			h1 = _crc32(c, self._s1 ^ _INT_SALT)
+			h2 = _crc16(c, self._s2 ^ _INT_SALT)
+		else:
+			hashes = self._hash_function(k, self._s1, self._s2)
+			if hashes is None:
+				raise KeyError('Key Error: ' + repr(k))
+			h1, h2 = hashes
+		n = self._n
+		if n > 0:
+			d0, d1 = divmod(self._disp[h1 % self._nb], n)
+			j = (h1 + d0 * h2 + d1) % n
+			if self._keys[j] == k:
+				return self._values[j]
+		raise KeyError('Key Error: ' + repr(k))
+
+	def to_bytes(self):
+		"""Return a bytes serialization of the map, including its hash parameters."""
+		disp = array('Q', self._disp)
+		if sys.byteorder == 'big':
+			disp.byteswap()
+		header = Map._HEADER.pack(Map._MAGIC, len(self._keys), len(self._disp), self._seed)
+		return header + disp.tobytes() + pickle.dumps((self._keys, self._values), 2)
+
+	@classmethod
+	def from_bytes(cls, data):
+		"""Return the map serialized in data by to_bytes, without rebuilding the hash."""
+		magic, n, nb, seed = Map._HEADER.unpack_from(data, 0)
+		if magic != Map._MAGIC:
+			raise ValueError('data is not a frozen map')
+		start = Map._HEADER.size
+		stop = start + nb * 8
+		disp = array('Q')
+		disp.frombytes(data[start:stop])
+		if sys.byteorder == 'big':
+			disp.byteswap()
+		m = cls.__new__(cls)
+		m._keys, m._values = pickle.loads(data[stop:])
+		m._set_hash(disp, seed)
+		return m
+
+
+	#------------------- nonpublic construction ---------------------
+	@staticmethod
+	def _seeds(seed):
+		"""Return the crc32 and crc16 start values derived from seed."""
+		return (seed * 0x9E3779B1 + 0x7F4A7C15) & 0xFFFFFFFF, (seed * 0x85EB + 0x1656) & 0xFFFF
+
+	@staticmethod
+	def _hash_function(k, s1, s2):
+		"""Return two hashes (h1, h2) of key k for the given start values, or None
+		if k is not a str, bytes or integral number. A str is hashed by crc32 and
+		crc16 of its UTF-8 bytes and a 64-bit int the same way over its 8 bytes
+		(with salted start values); other keys are reduced to these through
+		MapFile's canonical key bytes. h1 selects the bucket and the slot, h2
+		spreads a bucket's keys."""
+		if type(k) is str:
+			c = k.encode('utf-8', 'surrogatepass')
+			return _crc32(c, s1), _crc16(c, s2)
+		if type(k) is int and _INT_MIN <= k <= _INT_MAX:
+			c = _pack_int(k)
+			return _crc32(c, s1 ^ _INT_SALT), _crc16(c, s2 ^ _INT_SALT)
+		kb = MapFile.Map._key_bytes(k)
+		if kb is None:
+			return None
+		tag, body = kb[:1], kb[1:]
+		if tag == b's':
+			return Map._hash_function(body.decode('utf-8', 'surrogatepass'), s1, s2)
+		if tag == b'i':
+			v = int.from_bytes(body, 'little', signed=True)
+			if _INT_MIN <= v <= _INT_MAX:
+				return Map._hash_function(v, s1, s2)
+		salt = tag[0]						# keeps bytes and big ints apart from str
+		return _crc32(body, s1 ^ salt), _crc16(body, s2 ^ salt)
+
+	def _set_hash(self, disp, seed):
+		self._disp = disp
+		self._seed = seed
+		self._s1, self._s2 = self._seeds(seed)
+		self._n = len(self._keys)
+		self._nb = len(disp)
+
+	def _build(self, keys, values):
+		"""Find displacements placing every key in its own slot, retrying with
+		another seed in the (unlikely) case that a bucket cannot be placed.
+		Raise TypeError for a key that is not a str, bytes or integer."""
+		for k in keys:
+			if MapFile.Map._key_bytes(k) is None:
+				raise TypeError('frozen map keys must be str, bytes or int, not ' + type(k).__name__)
+		for seed in range(Map._MAX_SEEDS):
+			slots = self._place(keys, seed)
+			if slots is not None:
+				disp, order = slots
+				self._keys = [keys[i] for i in order]
+				self._values = [values[i] for i in order]
+				self._set_hash(disp, seed)
+				return
+		raise ValueError('could not build a perfect hash')
+
+	def _place(self, keys, seed):
+		"""Return (displacements, slot order) for the keys, or None on failure."""
+		n = len(keys)
+		nb = n // 2 + 1
+		disp = array('Q', [0]) * nb
+		if n == 0:
+			return disp, []
+		s1, s2 = self._seeds(seed)
+		hashes = []
+		for k in keys:
+			h1, h2 = self._hash_function(k, s1, s2)
+			hashes.append((h1 % nb, h1, h2))
+		buckets = [[] for b in range(nb)]
+		for i in range(n):
+			buckets[hashes[i][0]].append(i)
+		taken = bytearray(n)
+		order = [None] * n				# order[j] = index of the key stored in slot j
+		free = 0						# every slot below free is taken
+		limit = 64 * n + 1024
+		for b in sorted(range(nb), key=lambda b: -len(buckets[b])):
+			members = buckets[b]
+			if not members:
+				break
+			if len(members) == 1:		# a single key can be sent to any free slot directly
+				while taken[free]:
+					free += 1
+				i = members[0]
+				disp[b] = (free - hashes[i][1]) % n
+				taken[free] = 1
+				order[free] = i
+				continue
+			for d in range(limit):
+				d0, d1 = divmod(d, n)
+				positions = [(hashes[i][1] + d0 * hashes[i][2] + d1) % n for i in members]
+				if len(set(positions)) == len(positions) and not any(taken[j] for j in positions):
+					break
+			else:
+				return None
+			disp[b] = d
+			for (i, j) in zip(members, positions):
+				taken[j] = 1
+				order[j] = i
+		return disp, order
+
+
+#---------------------------- utility ----------------------------------
+def freeze(m):
+	"""Return an immutable, perfectly hashed copy of map m (any mapping or (k, v) pairs)."""
+	return Map(m)
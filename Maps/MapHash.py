@@ -4,9 +4,14 @@ Operation 					Running Time
 ------------------------------------------
 getitem 					O(1) expected, O(n) worst
 setitem 					O(1) expected, O(n) worst
-getitem 					O(1) expected, O(n) worst
+delitem 					O(1) expected, O(n) worst
 len 						O(1)
 iter 						O(n)
+update_bulk 				O(n + m) expected, one resize at most
+
+With incremental=True a resize no longer rebuilds the table at once: the old
+table is kept beside the new one and at most `step` old buckets are migrated
+on every getitem, setitem and delitem, bounding the latency of each call.
 
 """
 
@@ -35,49 +40,169 @@ class Map(MutableMapping):
 
 
 	#-------------------- public methods ---------------------------
-	def __init__(self, cap = 11, p=109345121):
-		"""Create an empty hash-table map."""
+	def __init__(self, cap = 11, p=109345121, incremental=False, step=4):
+		"""Create an empty hash-table map.
+		If incremental is True, resizes migrate step buckets per operation, or more
+		if needed to finish before the next resize is due."""
 		self._table = cap * [None]
 		self._n = 0
 		self._prime = p
 		self._scale = 1 + random.randrange(p-1)
 		self._shift = random.randrange(p)
+		self._incremental = incremental
+		self._step = step
+		self._quota = step				# buckets migrated per operation in the current rehash
+		self._old = None				# table being drained during an incremental rehash
+		self._migrated = 0				# number of old buckets already moved
+		self._iterators = 0				# live iterators; migration pauses while any exist
 
 	def __len__(self):
 		return self._n
 
 	def __iter__(self):
-		for bucket in self._table:
-			if bucket is not None:
-				for key in bucket:
-					yield key
+		self._iterators += 1
+		try:
+			for table in (self._old, self._table):
+				if table is not None:
+					for bucket in table:
+						if bucket is not None:
+							for key in bucket:
+								yield key
+		finally:
+			self._iterators -= 1
 
 	def _hash_function(self, k):
 		return (hash(k)*self._scale + self._shift) % self._prime % len(self._table)
 
+	def _old_hash_function(self, k):
+		return (hash(k)*self._scale + self._shift) % self._prime % len(self._old)
+
 	def __getitem__(self, k):
+		self._rehash_step()
+		if self._old is not None:
+			bucket = self._old[self._old_hash_function(k)]
+			if bucket is not None and k in bucket:
+				return bucket[k]
 		j = self._hash_function(k)
 		return self._bucket_getitem(j, k)
 
 	def __setitem__(self, k, v):
+		self._rehash_step()
+		if self._old is not None:
+			bucket = self._old[self._old_hash_function(k)]
+			if bucket is not None and k in bucket:
+				del bucket[k]			# the key moves to the new table below
+				self._n -= 1
 		j = self._hash_function(k)
 		self._bucket_setitem(j, k, v)
 		if self._n > len(self._table) // 2:
 			self._resize(2 * len(self._table) - 1)
 
 	def __delitem__(self, k):
-		j = self.hash_function(k)
+		self._rehash_step()
+		if self._old is not None:
+			bucket = self._old[self._old_hash_function(k)]
+			if bucket is not None and k in bucket:
+				del bucket[k]
+				self._n -= 1
+				return
+		j = self._hash_function(k)
 		self._bucket_delitem(j, k)
 		self._n -= 1
 
+	@classmethod
+	def from_items(cls, items, size_hint=None, **kwargs):
+		"""Create a map holding the (k, v) pairs of items, sizing its table once.
+		Remaining keyword arguments are passed to the constructor."""
+		m = cls(**kwargs)
+		m.update_bulk(items, size_hint)
+		return m
+
+	def update_bulk(self, items, size_hint=None):
+		"""Insert all pairs of items (a mapping or an iterable of (k, v) pairs).
+		The table is sized once up front for size_hint new keys (len(items) if no
+		hint is given, materializing items if needed) and doubled as usual if
+		the hint turns out too small."""
+		if hasattr(items, 'keys'):
+			source = items
+			items = ((k, source[k]) for k in source)
+			if size_hint is None:
+				size_hint = len(source)
+		elif size_hint is None:
+			if not hasattr(items, '__len__'):
+				items = list(items)
+			size_hint = len(items)
+		need = self._n + size_hint
+		if need > len(self._table) // 2:
+			self._rebuild(2 * need + 1)
+		elif self._old is not None:
+			self._finish_rehash()
+		for (k, v) in items:
+			self._bucket_setitem(self._hash_function(k), k, v)
+			if self._n > len(self._table) // 2:		# size_hint was too small
+				self._rebuild(2 * len(self._table) - 1)
+
+	def is_rehashing(self):
+		"""Return True if an incremental rehash is in progress."""
+		return self._old is not None
+
+	def rehash_progress(self):
+		"""Return the fraction (0.0 to 1.0) of old buckets already migrated.
+		Return 1.0 if no incremental rehash is in progress."""
+		if self._old is None:
+			return 1.0
+		return self._migrated / float(len(self._old))
+
 
 	#------------------- nonpublic bucket implementation ---------------
 	def _resize(self, c):
-		old = list(self.item())
+		if not self._incremental:
+			self._rebuild(c)
+			return
+		if self._old is not None:
+			self._finish_rehash()
+		self._old = self._table
+		self._table = c * [None]
+		self._migrated = 0
+		room = max(1, c // 2 - self._n)			# inserts left before the next resize
+		self._quota = max(self._step, -(-len(self._old) // room))
+
+	def _rebuild(self, c):
+		"""Move every item into a new table of capacity c in a single pass."""
+		if self._old is not None:
+			self._finish_rehash()
+		old = list(self.items())
 		self._table = c * [None]
 		self._n = 0
 		for (k, v) in old:
-			self[k] = v
+			self._bucket_setitem(self._hash_function(k), k, v)
+
+	def _rehash_step(self):
+		"""Migrate at most self._quota buckets from the old table to the new one."""
+		if self._old is None or self._iterators:
+			return
+		stop = min(self._migrated + self._quota, len(self._old))
+		for i in range(self._migrated, stop):
+			self._move_bucket(i)
+		self._migrated = stop
+		if self._migrated == len(self._old):
+			self._old = None
+
+	def _finish_rehash(self):
+		"""Migrate all remaining buckets of the old table."""
+		for i in range(self._migrated, len(self._old)):
+			self._move_bucket(i)
+		self._old = None
+
+	def _move_bucket(self, i):
+		bucket = self._old[i]
+		if bucket is not None:
+			for k in bucket:
+				j = self._hash_function(k)
+				if self._table[j] is None:
+					self._table[j] = MapUnsorted.Map()
+				self._table[j][k] = bucket[k]
+			self._old[i] = None
 
 	def _bucket_getitem(self, j, k):
 		bucket = self._table[j]
@@ -0,0 +1,120 @@
+"""
+Hash map implemented with open addressing (linear probing) for collision resolution.
+Hashes, keys and values are kept in three flat parallel lists, so an entry costs
+no bucket or item object and a lookup never leaves the table.
+Operation 					Running Time
+------------------------------------------
+getitem 					O(1) expected, O(n) worst
+setitem 					O(1) expected, O(n) worst
+delitem 					O(1) expected, O(n) worst
+len 						O(1)
+iter 						O(n)
+
+"""
+
+from collections import MutableMapping
+import random
+
+class Map(MutableMapping):
+
+	_AVAIL = object()		# sentinel key marking a deleted slot (tombstone)
+
+	#-------------------- public methods ---------------------------
+	def __init__(self, cap = 11, p=109345121):
+		"""Create an empty hash-table map."""
+		self._hashes = cap * [None]		# None marks a slot that was never used
+		self._keys = cap * [None]
+		self._values = cap * [None]
+		self._n = 0						# number of live items
+		self._used = 0					# number of live items plus tombstones
+		self._prime = p
+		self._scale = 1 + random.randrange(p-1)
+		self._shift = random.randrange(p)
+
+	def __len__(self):
+		return self._n
+
+	def __iter__(self):
+		hashes, keys = self._hashes, self._keys
+		for j in range(len(hashes)):
+			if hashes[j] is not None and keys[j] is not Map._AVAIL:
+				yield keys[j]
+
+	def _hash_function(self, h):
+		"""Compress a full hash code h into a slot index of the table."""
+		return (h*self._scale + self._shift) % self._prime % len(self._hashes)
+
+	def __getitem__(self, k):
+		j = self._find_slot(k, hash(k))
+		if j < 0:
+			raise KeyError('Key Error: ' + repr(k))
+		return self._values[j]
+
+	def __setitem__(self, k, v):
+		h = hash(k)
+		j = self._find_slot(k, h)
+		if j >= 0:
+			self._values[j] = v
+			return
+		j = -j - 1								# first free slot reported by the probe
+		if self._hashes[j] is None:
+			self._used += 1
+		self._hashes[j] = h
+		self._keys[j] = k
+		self._values[j] = v
+		self._n += 1
+		if self._used > len(self._hashes) // 2:
+			if self._n > len(self._hashes) // 4:
+				self._resize(2 * len(self._hashes) - 1)
+			else:
+				self._resize(len(self._hashes))	# mostly tombstones: purge in place
+
+	def __delitem__(self, k):
+		j = self._find_slot(k, hash(k))
+		if j < 0:
+			raise KeyError('Key Error: ' + repr(k))
+		self._keys[j] = Map._AVAIL				# hash stays set so probes continue past it
+		self._values[j] = None
+		self._n -= 1
+
+
+	#------------------- nonpublic probing implementation ---------------
+	def _find_slot(self, k, h):
+		"""Search for key k with full hash h.
+		Return its slot index j >= 0 if found, otherwise -(f + 1) where f is
+		the first available slot met along the probe sequence."""
+		hashes, keys = self._hashes, self._keys
+		cap = len(hashes)
+		j = self._hash_function(h)
+		first_avail = None
+		while True:
+			stored = hashes[j]
+			if stored is None:
+				if first_avail is None:
+					first_avail = j
+				return -first_avail - 1
+			key = keys[j]
+			if key is Map._AVAIL:
+				if first_avail is None:
+					first_avail = j
+			elif stored == h and (key is k or key == k):
+				return j
+			j = (j + 1) % cap
+
+	def _resize(self, c):
+		"""Rebuild the table with capacity c, dropping all tombstones.
+		Stored hashes are reused, so no key is hashed again."""
+		old_hashes, old_keys, old_values = self._hashes, self._keys, self._values
+		self._hashes = c * [None]
+		self._keys = c * [None]
+		self._values = c * [None]
+		for i in range(len(old_hashes)):
+			h = old_hashes[i]
+			if h is not None and old_keys[i] is not Map._AVAIL:
+				j = self._hash_function(h)
+				while self._hashes[j] is not None:
+					j = (j + 1) % c
+				self._hashes[j] = h
+				self._keys[j] = old_keys[i]
+				self._values[j] = old_values[i]
+		self._used = self._n
@@ -4,10 +4,13 @@ Operation							Running Time
 --------------------------------------------------
 len(M)								O(1)
 k in M 								O(log n)
+get_many, contains_many				O(k log(n/k)) for k sorted keys
 M[k] = v 							O(n) worst, O(log n) if exist
 del M[K] 							O(n) worst
 find_min, find_max					O(1)
 find_gt, find_lt					O(log n)
+rank, count_range					O(log n)
+select								O(1)
 iter(M), reversed(M)				O(n)
 """
 
@@ -38,16 +41,51 @@ class Map(MutableMapping):
 		"""Return the index of the leftmost item with key greater than or equal to k.
 		Return high + 1 if no such item qualifies.
 		"""
-		if high < low:
-			return high + 1
-		else:
+		table = self._table
+		while low <= high:
 			mid = (low + high) // 2
-			if k == self._table[mid]._key:
+			key = table[mid]._key
+			if k == key:
 				return mid
-			elif k < self._table[mid]._key:
-				return self._find_index(k, low, mid-1)
+			elif k < key:
+				high = mid - 1
+			else:
+				low = mid + 1
+		return high + 1
+
+	def _gallop(self, k, low):
+		"""Return the index of the leftmost item at or after low with key >= k.
+		Probe low, low+1, low+3, low+7, ... before a binary search, so the cost
+		is O(log d) when the answer lies d positions past low."""
+		table = self._table
+		n = len(table)
+		step = 1
+		prev = low - 1						# every key up to prev is known to be < k
+		probe = low
+		while probe < n and table[probe]._key < k:
+			prev = probe
+			probe = low + 2 * step - 1
+			step *= 2
+		return self._find_index(k, prev + 1, min(probe, n) - 1)
+
+	def _sweep(self, keys):
+		"""Generate (k, j) for each k of keys, where j is the index of k in the
+		table or -1 if absent. Ascending keys are located in a single forward
+		merge; a key smaller than its predecessor restarts from the front."""
+		table = self._table
+		j = 0
+		last = None
+		first = True
+		for k in keys:
+			if not first and k < last:
+				j = 0
+			first = False
+			last = k
+			j = self._gallop(k, j)
+			if j < len(table) and table[j]._key == k:
+				yield (k, j)
 			else:
-				return self._find_index(k, mid + 1, high)
+				yield (k, -1)
 
 	#-------------------- public behaviors ------------------------
 	def __init__(self):
@@ -90,6 +128,16 @@ class Map(MutableMapping):
 			raise KeyError('Key Error: ' + repr(k))
 		self._table.pop(j)
 
+	def get_many(self, sorted_keys, default=None):
+		"""Return a list with the value of every key in sorted_keys (default if absent).
+		The keys should be in ascending order; they are answered in one galloping sweep."""
+		return [self._table[j]._value if j >= 0 else default for (k, j) in self._sweep(sorted_keys)]
+
+	def contains_many(self, sorted_keys):
+		"""Return a list of booleans telling whether each key of sorted_keys is in the map.
+		The keys should be in ascending order; they are answered in one galloping sweep."""
+		return [j >= 0 for (k, j) in self._sweep(sorted_keys)]
+
 	#----------------------- locating methods ------------------------
 	def find_min(self):
 		"""Return (key, value) pair with minimum key (or None if empty)."""
@@ -133,4 +181,22 @@ class Map(MutableMapping):
 			j = self._find_index(start, 0, len(self._table) - 1)
 		while j < len(self._table) and (stop is None or self._table[j]._key < stop):
 			yield (self._table[j]._key, self._table[j]._value)
-			j += 1
\ No newline at end of file
+			j += 1
+
+	#------------------- order statistics ----------------------------
+	def rank(self, k):
+		"""Return the number of keys strictly less than k."""
+		return self._find_index(k, 0, len(self._table) - 1)
+
+	def select(self, i):
+		"""Return (key, value) pair with the i-th smallest key (0-based).
+		Negative i counts from the maximum; raise IndexError if out of range."""
+		item = self._table[i]
+		return (item._key, item._value)
+
+	def count_range(self, start, stop):
+		"""Return the number of keys such that start <= key < stop.
+		None bounds are treated as in find_range."""
+		low = 0 if start is None else self.rank(start)
+		high = len(self._table) if stop is None else self.rank(stop)
+		return max(high - low, 0)
@@ -0,0 +1,244 @@
+"""
+Sorted map implementation using a list of bounded-size sorted chunks.
+The chunks play the role of a B+-tree leaf level: a separate list of the
+maximum key of every chunk is bisected to find the right chunk, so an insert
+or delete only shifts the items of one small chunk.
+Operation							Running Time
+--------------------------------------------------
+len(M)								O(1)
+k in M 								O(log n)
+M[k] = v 							O(log n + L)	(L = chunk load)
+del M[K] 							O(log n + L)
+find_min, find_max					O(1)
+find_gt, find_lt					O(log n)
+rank, select, count_range			O(log n)	(after a split or merge, O(n / L) once)
+iter(M), reversed(M)				O(n)
+"""
+
+from collections import MutableMapping
+from bisect import bisect_left, bisect_right
+
+class Map(MutableMapping):
+
+	DEFAULT_LOAD = 500		# chunks are split above 2 * load and merged below load / 2
+
+	#------------------ non public behaviors ---------------------
+	def _find_index(self, k):
+		"""Return (i, j) locating the leftmost item with key greater than or equal to k.
+		Return (number of chunks, 0) if no such item qualifies."""
+		i = bisect_left(self._maxes, k)
+		if i == len(self._maxes):
+			return (i, 0)
+		return (i, bisect_left(self._keys[i], k))
+
+	def _item(self, i, j):
+		return (self._keys[i][j], self._values[i][j])
+
+	def _split(self, i):
+		"""Split chunk i into two halves."""
+		keys, values = self._keys[i], self._values[i]
+		half = len(keys) // 2
+		self._keys.insert(i + 1, keys[half:])
+		self._values.insert(i + 1, values[half:])
+		del keys[half:]
+		del values[half:]
+		self._maxes.insert(i, keys[-1])
+		self._index = None
+
+	def _merge(self, i):
+		"""Merge chunk i into a neighbour, splitting the result again if it is too big."""
+		if i == 0:
+			i = 1								# merge chunk 1 into chunk 0
+		self._keys[i-1].extend(self._keys[i])
+		self._values[i-1].extend(self._values[i])
+		self._maxes[i-1] = self._maxes[i]
+		del self._keys[i], self._values[i], self._maxes[i]
+		self._index = None
+		if len(self._keys[i-1]) > 2 * self._load:
+			self._split(i - 1)
+
+	def _build_index(self):
+		"""Build the Fenwick tree over chunk lengths used by positional queries."""
+		index = [0] + [len(keys) for keys in self._keys]
+		for i in range(1, len(index)):
+			parent = i + (i & -i)
+			if parent < len(index):
+				index[parent] += index[i]
+		self._index = index
+
+	def _update_index(self, i, delta):
+		"""Add delta to the length of chunk i in the Fenwick tree, if it is built."""
+		if self._index is not None:
+			i += 1
+			while i < len(self._index):
+				self._index[i] += delta
+				i += i & -i
+
+	def _prefix(self, i):
+		"""Return the number of items stored in chunks 0 to i-1."""
+		if self._index is None:
+			self._build_index()
+		total = 0
+		while i > 0:
+			total += self._index[i]
+			i -= i & -i
+		return total
+
+	#-------------------- public behaviors ------------------------
+	def __init__(self, load=DEFAULT_LOAD):
+		"""Create an empty map."""
+		self._keys = []			# sorted chunks of keys
+		self._values = []		# chunks of values parallel to self._keys
+		self._maxes = []		# maximum key of every chunk
+		self._n = 0
+		self._load = load
+		self._index = None		# Fenwick tree of chunk lengths, built on demand
+
+	def __len__(self):
+		"""Return number of items in the map."""
+		return self._n
+
+	def __iter__(self):
+		"""Generate keys of the map ordered from minimum to maximum."""
+		for keys in self._keys:
+			for k in keys:
+				yield k
+
+	def __reversed__(self):
+		"""Generate keys of the map ordered from maximum to minimum."""
+		for keys in reversed(self._keys):
+			for k in reversed(keys):
+				yield k
+
+	def __getitem__(self, k):
+		"""Return value associated with key k (raise KeyError if not found)."""
+		i, j = self._find_index(k)
+		if i == len(self._keys) or self._keys[i][j] != k:
+			raise KeyError('Key Error: ' + repr(k))
+		return self._values[i][j]
+
+	def __setitem__(self, k, v):
+		"""Assign value to v to key k, overwriting existing value if present."""
+		if not self._keys:
+			self._keys.append([k])
+			self._values.append([v])
+			self._maxes.append(k)
+			self._n = 1
+			self._index = None
+			return
+		i, j = self._find_index(k)
+		if i == len(self._keys):				# new maximum: append to the last chunk
+			i -= 1
+			j = len(self._keys[i])
+			self._maxes[i] = k
+		elif self._keys[i][j] == k:
+			self._values[i][j] = v
+			return
+		self._keys[i].insert(j, k)
+		self._values[i].insert(j, v)
+		self._n += 1
+		self._update_index(i, 1)
+		if len(self._keys[i]) > 2 * self._load:
+			self._split(i)
+
+	def __delitem__(self, k):
+		"""Remove item associated with key k (raise KeyError if not found."""
+		i, j = self._find_index(k)
+		if i == len(self._keys) or self._keys[i][j] != k:
+			raise KeyError('Key Error: ' + repr(k))
+		keys = self._keys[i]
+		del keys[j]
+		del self._values[i][j]
+		self._n -= 1
+		if not keys:
+			del self._keys[i], self._values[i], self._maxes[i]
+			self._index = None
+			return
+		self._update_index(i, -1)
+		self._maxes[i] = keys[-1]
+		if len(keys) < self._load // 2 and len(self._keys) > 1:
+			self._merge(i)
+
+	#----------------------- locating methods ------------------------
+	def find_min(self):
+		"""Return (key, value) pair with minimum key (or None if empty)."""
+		if self._n > 0:
+			return self._item(0, 0)
+		else:
+			return None
+
+	def find_max(self):
+		"""Return (key, value) pair with maximum key (or None if empty)."""
+		if self._n > 0:
+			return self._item(-1, -1)
+		else:
+			return None
+
+	def find_lt(self, k):
+		"""Return (key, value) pair with greatest key less than k."""
+		i, j = self._find_index(k)
+		if j > 0:
+			return self._item(i, j-1)
+		elif i > 0:
+			return self._item(i-1, -1)
+		else:
+			return None
+
+	def find_gt(self, k):
+		"""Return (key, value) pair with least key strictly greater than k."""
+		i = bisect_right(self._maxes, k)
+		if i == len(self._maxes):
+			return None
+		return self._item(i, bisect_right(self._keys[i], k))
+
+	def find_range(self, start, stop):
+		"""Iterate all (key, value) pairs such that start <= key < stop.
+		If start is None, iteration begins with minimum key of map.
+		if stop is None, iteration continues through the maximum key of map."""
+		if start is None:
+			i, j = 0, 0
+		else:
+			i, j = self._find_index(start)
+		while i < len(self._keys):
+			keys, values = self._keys[i], self._values[i]
+			while j < len(keys):
+				if stop is not None and not keys[j] < stop:
+					return
+				yield (keys[j], values[j])
+				j += 1
+			i += 1
+			j = 0
+
+	#------------------- order statistics ----------------------------
+	def rank(self, k):
+		"""Return the number of keys strictly less than k."""
+		i, j = self._find_index(k)
+		return self._prefix(i) + j
+
+	def select(self, i):
+		"""Return (key, value) pair with the i-th smallest key (0-based).
+		Negative i counts from the maximum; raise IndexError if out of range."""
+		if i < 0:
+			i += self._n
+		if not 0 <= i < self._n:
+			raise IndexError('Index out of range')
+		if self._index is None:
+			self._build_index()
+		pos = 0									# descend the Fenwick tree
+		step = 1
+		while 2 * step < len(self._index):
+			step *= 2
+		while step > 0:
+			nxt = pos + step
+			if nxt < len(self._index) and self._index[nxt] <= i:
+				pos = nxt
+				i -= self._index[nxt]
+			step //= 2
+		return self._item(pos, i)
+
+	def count_range(self, start, stop):
+		"""Return the number of keys such that start <= key < stop.
+		None bounds are treated as in find_range."""
+		low = 0 if start is None else self.rank(start)
+		high = self._n if stop is None else self.rank(stop)
+		return max(high - low, 0)
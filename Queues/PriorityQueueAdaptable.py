@@ -0,0 +1,82 @@
+"""
+An adaptable min-oriented priority queue implemented with an array-based binary heap.
+enqueue returns a locator that remembers the current heap index of its item,
+so the item's key can be changed or the item removed in place, without
+leaving stale duplicates in the heap.
+Operation       Running Time
+----------------------------
+S.enqueue(e)    O(log n)
+S.dequeue()     O(log n)
+S.update(l)     O(log n)
+S.remove(l)     O(log n)
+S.peek()        O(1)
+S.is_empty()    O(1)
+len(S)          O(1)
+
+"""
+
+import PriorityQueueHeap
+
+class PriorityQueue(PriorityQueueHeap.PriorityQueue):
+
+	#---------------------- nested Locator class ----------------------
+	class Locator(PriorityQueueHeap.PriorityQueue._Item):
+		"""Token for locating an entry of the priority queue."""
+		__slots__ = '_index'
+
+		def __init__(self, k, v, j):
+			PriorityQueueHeap.PriorityQueue._Item.__init__(self, k, v)
+			self._index = j
+
+	#--------------------- public methods --------------------------
+	def __init__(self, contents=()):
+		"""Create a new Priority Queue, optionally holding (k, v) pairs of contents."""
+		self._data = [self.Locator(k, v, j) for j, (k, v) in enumerate(contents)]
+		if len(self._data) > 1:
+			self._heap_construction()
+
+	def enqueue(self, key, value):
+		"""Add a key-value pair and return a Locator for it."""
+		token = self.Locator(key, value, len(self._data))
+		self._data.append(token)
+		self._upheap(len(self._data) - 1)
+		return token
+
+	def update(self, loc, newkey, newval):
+		"""Update the key and value of the entry identified by Locator loc."""
+		j = self._validate(loc)
+		loc._key = newkey
+		loc._value = newval
+		self._bubble(j)
+
+	def remove(self, loc):
+		"""Remove and return the (k,v) pair identified by Locator loc."""
+		j = self._validate(loc)
+		if j == len(self) - 1:
+			self._data.pop()
+		else:
+			self._swap(j, len(self) - 1)
+			self._data.pop()
+			self._bubble(j)
+		return (loc._key, loc._value)
+
+	#--------------------- non public methods -----------------------
+	def _validate(self, loc):
+		"""Return the index of Locator loc, raising ValueError if it is not in the queue."""
+		j = loc._index if isinstance(loc, self.Locator) else -1
+		if not (0 <= j < len(self) and self._data[j] is loc):
+			raise ValueError('Invalid locator')
+		return j
+
+	def _swap(self, i, j):
+		"""Swap the elements at indices i and j of array, and update their locators"""
+		PriorityQueueHeap.PriorityQueue._swap(self, i, j)
+		self._data[i]._index = i
+		self._data[j]._index = j
+
+	def _bubble(self, j):
+		"""Move the entry at index j up or down to restore the heap order."""
+		if j > 0 and self._data[j] < self._data[self._parent(j)]:
+			self._upheap(j)
+		else:
+			self._downheap(j)
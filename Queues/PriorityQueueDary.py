@@ -0,0 +1,149 @@
+"""
+A min-oriented priority queue implemented with an array-based d-ary heap.
+Node i has children d*i+1 .. d*i+d. Sifting is iterative and moves a "hole"
+instead of swapping: entries are shifted into the hole and the moving entry is
+written once at its final index. A wider heap (d = 4 or 8) is shallower, so
+dequeue visits fewer levels at the price of more comparisons per level; run
+this module as a script to compare arities on a few queue depths.
+Operation       Running Time
+----------------------------
+S.enqueue(e)    O(log_d n)
+S.dequeue()     O(d log_d n)
+S.peek()        O(1)
+S.is_empty()    O(1)
+len(S)          O(1)
+
+"""
+
+class Empty(Exception):
+    """Error attempting to access an element from an empty container."""
+    pass
+
+class PriorityQueue:
+
+	#---------------------- nested Item class ----------------------
+	class _Item:
+		"""Lightweight composition store priority queue items ."""
+		__slots__ = '_key', '_value'
+
+		def __init__(self, k, v):
+			self._key = k
+			self._value = v
+
+		def __lt__(self, other):
+			return self._key < other._key
+
+	#--------------------- public methods --------------------------
+	def __init__(self, contents=(), d=4):
+		"""Create a new Priority Queue of arity d, optionally holding (k, v) pairs of contents."""
+		if d < 2:
+			raise ValueError('arity must be at least 2')
+		self._d = d
+		self._data = [self._Item(k,v) for k,v in contents] #empty by default
+		if len(self._data) > 1:
+			self._heap_construction()
+
+	def __len__(self):
+		"""Return the size of the Priority Queue."""
+		return len(self._data)
+
+	def is_empty(self):
+		"""Return True if the priority queue is empty."""
+		return len(self._data) == 0
+
+	def peek(self):
+		"""Return but do not remove (k,v) tuple with minimum key.
+		Raise Empty exception if empty."""
+		if not self._data:
+			raise Empty('Priority queue is empty')
+		item = self._data[0]
+		return (item._key, item._value)
+
+	def enqueue(self, key, value):
+		"""Add a key-value pair to the priority queue."""
+		self._data.append(self._Item(key, value))
+		self._upheap(len(self._data) - 1)
+
+	def dequeue(self):
+		"""Remove and return (k,v) tuple with minimum key.
+		Raise Empty exception if empty."""
+		if not self._data:
+			raise Empty('Priority queue is empty')
+		last = self._data.pop()
+		if not self._data:
+			return (last._key, last._value)
+		item = self._data[0]
+		self._data[0] = last
+		self._downheap(0)
+		return (item._key, item._value)
+
+	#--------------------- non public methods -----------------------
+	def _upheap(self, i):
+		"""Move the entry at index i up, shifting larger parents down into the hole."""
+		data, d = self._data, self._d
+		item = data[i]
+		key = item._key
+		while i > 0:
+			parent = (i - 1) // d
+			above = data[parent]
+			if not key < above._key:
+				break
+			data[i] = above
+			i = parent
+		data[i] = item
+
+	def _downheap(self, i):
+		"""Move the entry at index i down, shifting the smallest child up into the hole."""
+		data, d = self._data, self._d
+		n = len(data)
+		item = data[i]
+		key = item._key
+		while True:
+			first = d * i + 1
+			if first >= n:
+				break
+			best = first
+			best_key = data[first]._key
+			for c in range(first + 1, min(first + d, n)):
+				child_key = data[c]._key
+				if child_key < best_key:
+					best = c
+					best_key = child_key
+			if not best_key < key:
+				break
+			data[i] = data[best]
+			i = best
+		data[i] = item
+
+	def _heap_construction(self):
+		"""Bottom up construction in linear time"""
+		for i in range((len(self._data) - 2) // self._d, -1, -1):
+			self._downheap(i)
+
+
+#------------------------------ benchmark ---------------------------------
+if __name__ == '__main__':
+	import random, time
+	import PriorityQueueHeap
+
+	def bench(make, depth, rounds):
+		"""Time a queue held at the given depth: fill it, then dequeue/enqueue rounds times."""
+		keys = [random.random() for i in range(depth + rounds)]
+		q = make()
+		start = time.time()
+		for j in range(depth):
+			q.enqueue(keys[j], j)
+		for j in range(depth, depth + rounds):
+			q.dequeue()
+			q.enqueue(keys[j], j)
+		while not q.is_empty():
+			q.dequeue()
+		return time.time() - start
+
+	makers = [('binary heap (PriorityQueueHeap)', PriorityQueueHeap.PriorityQueue)]
+	for d in (2, 4, 8):
+		makers.append(('%d-ary heap' % d, lambda d=d: PriorityQueue(d=d)))
+	for depth in (1000, 10000, 100000):
+		print('queue depth %d' % depth)
+		for (name, make) in makers:
+			print('  %-32s %.3fs' % (name, bench(make, depth, 100000)))
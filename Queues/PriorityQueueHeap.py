@@ -109,6 +109,7 @@ class PriorityQueue:
 
 			if self._data[small_child] < self._data[i]:
 				self._swap(i, small_child)
+				self._downheap(small_child)
 
 	def _heap_construction(self):
 		"""Bottom up construction in linear time"""
@@ -0,0 +1,129 @@
+"""
+A min-oriented priority queue for numeric keys, stored as a struct of arrays.
+Keys live in a typed array ('d' for floats, 'q' for integers) and values in a
+parallel list, so entries need no _Item objects and the sift loops compare
+raw numbers instead of dispatching to _Item.__lt__. Sifting moves a hole
+rather than swapping.
+Operation               Running Time
+------------------------------------
+S.enqueue(k, v)         O(log n)
+S.enqueue_many(pairs)   O(m log n), or O(n + m) if m >= n
+S.dequeue()             O(log n)
+S.dequeue_many(m)       O(m log n)
+S.peek()                O(1)
+S.is_empty()            O(1)
+len(S)                  O(1)
+
+"""
+
+from array import array
+
+class Empty(Exception):
+    """Error attempting to access an element from an empty container."""
+    pass
+
+class PriorityQueue:
+
+	#--------------------- public methods --------------------------
+	def __init__(self, contents=(), typecode='d'):
+		"""Create a new Priority Queue with keys of the given array typecode
+		('d' for float keys, 'q' for integer keys), optionally holding (k, v) pairs."""
+		self._keys = array(typecode)
+		self._values = []
+		self.enqueue_many(contents)
+
+	def __len__(self):
+		"""Return the size of the Priority Queue."""
+		return len(self._values)
+
+	def is_empty(self):
+		"""Return True if the priority queue is empty."""
+		return len(self._values) == 0
+
+	def peek(self):
+		"""Return but do not remove (k,v) tuple with minimum key.
+		Raise Empty exception if empty."""
+		if not self._values:
+			raise Empty('Priority queue is empty')
+		return (self._keys[0], self._values[0])
+
+	def enqueue(self, key, value):
+		"""Add a key-value pair to the priority queue."""
+		self._keys.append(key)
+		self._values.append(value)
+		self._upheap(len(self._values) - 1)
+
+	def enqueue_many(self, pairs):
+		"""Add every (k, v) pair of pairs. A batch at least as large as the
+		queue is appended whole and the heap rebuilt bottom-up in linear time."""
+		n = len(self._values)
+		for (k, v) in pairs:
+			self._keys.append(k)
+			self._values.append(v)
+		m = len(self._values) - n
+		if m >= n:
+			self._heap_construction()
+		else:
+			for i in range(n, n + m):
+				self._upheap(i)
+
+	def dequeue(self):
+		"""Remove and return (k,v) tuple with minimum key.
+		Raise Empty exception if empty."""
+		if not self._values:
+			raise Empty('Priority queue is empty')
+		keys, values = self._keys, self._values
+		last_key = keys.pop()
+		last_value = values.pop()
+		if not values:
+			return (last_key, last_value)
+		result = (keys[0], values[0])
+		self._downheap(0, last_key, last_value)
+		return result
+
+	def dequeue_many(self, m):
+		"""Remove and return a list of the (up to) m pairs with smallest keys, in order."""
+		result = []
+		while m > 0 and self._values:
+			result.append(self.dequeue())
+			m -= 1
+		return result
+
+	#--------------------- non public methods -----------------------
+	def _upheap(self, i):
+		"""Move the entry at index i up, shifting larger parents down into the hole."""
+		keys, values = self._keys, self._values
+		key = keys[i]
+		value = values[i]
+		while i > 0:
+			parent = (i - 1) >> 1
+			if not key < keys[parent]:
+				break
+			keys[i] = keys[parent]
+			values[i] = values[parent]
+			i = parent
+		keys[i] = key
+		values[i] = value
+
+	def _downheap(self, i, key, value):
+		"""Sift the entry (key, value) down from the hole at index i."""
+		keys, values = self._keys, self._values
+		n = len(values)
+		while True:
+			child = 2 * i + 1
+			if child >= n:
+				break
+			if child + 1 < n and keys[child + 1] < keys[child]:
+				child += 1
+			if not keys[child] < key:
+				break
+			keys[i] = keys[child]
+			values[i] = values[child]
+			i = child
+		keys[i] = key
+		values[i] = value
+
+	def _heap_construction(self):
+		"""Bottom up construction in linear time"""
+		for i in range((len(self._values) - 2) // 2, -1, -1):
+			self._downheap(i, self._keys[i], self._values[i])
@@ -0,0 +1,173 @@
+"""
+A meldable min-oriented priority queue implemented with a pairing heap.
+The heap is a multiway tree stored in child/sibling form. Two heaps are melded
+by making the root with the larger key the first child of the other root, so
+merge and enqueue are O(1); dequeue restructures the root's children with the
+two-pass pairing scheme. enqueue returns a locator for decrease_key.
+Every node points to an owner cell of its queue; merge forwards the other
+queue's cell to this one (union-find with path compression), so a locator's
+queue is found in near-O(1) and locators of other queues are rejected.
+Operation           Running Time
+------------------------------------
+S.enqueue(k, v)     O(1)
+S.merge(other)      O(1)
+S.decrease_key(l)   O(log n) amortized (o(log n) conjectured)
+S.dequeue()         O(log n) amortized
+S.peek()            O(1)
+S.is_empty()        O(1)
+len(S)              O(1)
+
+"""
+
+class Empty(Exception):
+    """Error attempting to access an element from an empty container."""
+    pass
+
+class PriorityQueue:
+
+	#---------------------- nested Locator class ----------------------
+	class Locator:
+		"""Heap node, handed out as a token for locating an entry."""
+		__slots__ = '_key', '_value', '_child', '_sibling', '_prev', '_owner'
+
+		def __init__(self, k, v, owner):
+			self._key = k
+			self._value = v
+			self._child = None		# first (leftmost) child
+			self._sibling = None	# next sibling to the right
+			self._prev = None		# left sibling, or parent for a first child
+			self._owner = owner		# owner cell of the queue holding the node
+
+	#---------------------- nested _Owner class -----------------------
+	class _Owner:
+		"""Ownership cell of a queue; a merged-away cell forwards to the merging queue's."""
+		__slots__ = '_forward'
+
+		def __init__(self):
+			self._forward = None
+
+	#--------------------- public methods --------------------------
+	def __init__(self, contents=()):
+		"""Create a new Priority Queue, optionally holding (k, v) pairs of contents."""
+		self._root = None
+		self._size = 0
+		self._owner = self._Owner()
+		for (k, v) in contents:
+			self.enqueue(k, v)
+
+	def __len__(self):
+		"""Return the size of the Priority Queue."""
+		return self._size
+
+	def is_empty(self):
+		"""Return True if the priority queue is empty."""
+		return self._size == 0
+
+	def peek(self):
+		"""Return but do not remove (k,v) tuple with minimum key.
+		Raise Empty exception if empty."""
+		if self.is_empty():
+			raise Empty('Priority queue is empty')
+		return (self._root._key, self._root._value)
+
+	def enqueue(self, key, value):
+		"""Add a key-value pair to the priority queue and return a Locator for it."""
+		node = self.Locator(key, value, self._owner)
+		self._root = self._link(self._root, node)
+		self._size += 1
+		return node
+
+	def dequeue(self):
+		"""Remove and return (k,v) tuple with minimum key.
+		Raise Empty exception if empty."""
+		if self.is_empty():
+			raise Empty('Priority queue is empty')
+		root = self._root
+		self._root = self._combine_children(root)
+		self._size -= 1
+		root._child = None
+		root._prev = root			# convention for a node no longer in any heap
+		return (root._key, root._value)
+
+	def merge(self, other):
+		"""Move every entry of other into this queue in O(1), leaving other empty.
+		Locators of other's entries stay valid and now refer to this queue."""
+		if other is self:
+			raise ValueError('Cannot merge a queue into itself')
+		self._root = self._link(self._root, other._root)
+		self._size += other._size
+		other._owner._forward = self._owner
+		other._root = None
+		other._size = 0
+		other._owner = self._Owner()
+
+	def decrease_key(self, loc, newkey):
+		"""Lower the key of the entry identified by Locator loc to newkey.
+		Raise ValueError if loc was removed, belongs to another queue, or newkey
+		is larger than its key."""
+		if not isinstance(loc, self.Locator) or loc._prev is loc:
+			raise ValueError('Invalid locator')
+		if self._find_owner(loc) is not self._owner:
+			raise ValueError('Locator belongs to another queue')
+		if loc._key < newkey:
+			raise ValueError('New key is larger than current key')
+		loc._key = newkey
+		if loc is not self._root:
+			self._cut(loc)
+			self._root = self._link(self._root, loc)
+
+	#--------------------- non public methods -----------------------
+	def _find_owner(self, loc):
+		"""Return the current owner cell of loc's queue, compressing the forward path."""
+		cell = loc._owner
+		while cell._forward is not None:
+			cell = cell._forward
+		walk = loc._owner
+		while walk is not cell:
+			walk._forward, walk = cell, walk._forward
+		loc._owner = cell
+		return cell
+
+	def _link(self, a, b):
+		"""Meld the heap-ordered trees rooted at a and b and return the new root."""
+		if a is None:
+			return b
+		if b is None:
+			return a
+		if b._key < a._key:
+			a, b = b, a
+		b._sibling = a._child
+		if a._child is not None:
+			a._child._prev = b
+		b._prev = a
+		a._child = b
+		a._sibling = a._prev = None
+		return a
+
+	def _cut(self, node):
+		"""Detach the subtree rooted at node from its parent and siblings."""
+		if node._prev._child is node:
+			node._prev._child = node._sibling
+		else:
+			node._prev._sibling = node._sibling
+		if node._sibling is not None:
+			node._sibling._prev = node._prev
+		node._prev = node._sibling = None
+
+	def _combine_children(self, root):
+		"""Two-pass pairing of root's children: meld them in pairs from left to
+		right, then meld the pairs from right to left. Return the new root."""
+		pairs = []
+		walk = root._child
+		while walk is not None:
+			first = walk
+			second = walk._sibling
+			walk = second._sibling if second is not None else None
+			first._sibling = first._prev = None
+			if second is not None:
+				second._sibling = second._prev = None
+			pairs.append(self._link(first, second))
+		result = None
+		for tree in reversed(pairs):
+			result = self._link(tree, result)
+		return result
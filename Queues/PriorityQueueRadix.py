@@ -0,0 +1,131 @@
+"""
+A monotone min-oriented priority queue for non-negative integer keys (radix heap).
+Keys may never be smaller than the last key dequeued, as in Dijkstra's
+algorithm or a timer wheel. An entry with key k sits in bucket
+bit_length(k XOR last), where last is the last minimum found; when bucket 0
+runs dry, the first non-empty bucket is redistributed around its minimum and
+every entry only ever moves to lower buckets. No key comparisons between
+entries are needed apart from finding a bucket's minimum.
+Run this module as a script to compare it with the binary heap on Dijkstra.
+Operation       Running Time    (C = largest key - smallest key)
+----------------------------
+S.enqueue(e)    O(1)
+S.dequeue()     Amortized O(log C)
+S.peek()        O(b)    (b = size of the first non-empty bucket)
+S.is_empty()    O(1)
+len(S)          O(1)
+
+"""
+
+class Empty(Exception):
+    """Error attempting to access an element from an empty container."""
+    pass
+
+class PriorityQueue:
+
+	#--------------------- public methods --------------------------
+	def __init__(self, contents=()):
+		"""Create a new Priority Queue, optionally holding (k, v) pairs of contents."""
+		self._buckets = [[]]			# bucket i holds (k, v) with bit_length(k ^ last) == i
+		self._last = 0
+		self._size = 0
+		for (k, v) in contents:
+			self.enqueue(k, v)
+
+	def __len__(self):
+		"""Return the size of the Priority Queue."""
+		return self._size
+
+	def is_empty(self):
+		"""Return True if the priority queue is empty."""
+		return self._size == 0
+
+	def peek(self):
+		"""Return but do not remove (k,v) tuple with minimum key.
+		Raise Empty exception if empty. The buckets are left as they are, since
+		redistributing them would raise the last minimum that enqueue checks."""
+		if self.is_empty():
+			raise Empty('Priority queue is empty')
+		buckets = self._buckets
+		i = 0
+		while not buckets[i]:
+			i += 1
+		if i == 0:
+			return buckets[0][-1]
+		return min(buckets[i], key=lambda entry: entry[0])
+
+	def enqueue(self, key, value):
+		"""Add a key-value pair to the priority queue.
+		Raise ValueError if key is below the last key dequeued."""
+		if key < self._last:
+			raise ValueError('Key ' + repr(key) + ' is below the last minimum ' + repr(self._last))
+		self._bucket(key).append((key, value))
+		self._size += 1
+
+	def dequeue(self):
+		"""Remove and return (k,v) tuple with minimum key.
+		Raise Empty exception if empty."""
+		if self.is_empty():
+			raise Empty('Priority queue is empty')
+		self._refill()
+		self._size -= 1
+		return self._buckets[0].pop()
+
+	#--------------------- non public methods -----------------------
+	def _bucket(self, key):
+		"""Return the bucket for key relative to the current last minimum."""
+		i = (key ^ self._last).bit_length()
+		while i >= len(self._buckets):
+			self._buckets.append([])
+		return self._buckets[i]
+
+	def _refill(self):
+		"""Make bucket 0 non-empty by redistributing the first non-empty bucket
+		around its minimum key (the queue must not be empty)."""
+		buckets = self._buckets
+		if buckets[0]:
+			return
+		i = 1
+		while not buckets[i]:
+			i += 1
+		moving = buckets[i]
+		buckets[i] = []
+		self._last = min(entry[0] for entry in moving)
+		for entry in moving:
+			self._bucket(entry[0]).append(entry)
+
+
+#------------------------------ benchmark ---------------------------------
+if __name__ == '__main__':
+	import random, time
+	import PriorityQueueHeap
+
+	def dijkstra(graph, source, queue):
+		"""Return shortest distances from source, using queue as the frontier."""
+		dist = {source: 0}
+		done = set()
+		queue.enqueue(0, source)
+		while not queue.is_empty():
+			d, u = queue.dequeue()
+			if u in done:
+				continue
+			done.add(u)
+			for (v, w) in graph[u]:
+				if v not in dist or d + w < dist[v]:
+					dist[v] = d + w
+					queue.enqueue(d + w, v)
+		return dist
+
+	random.seed(1)
+	for (n, m, c) in ((10000, 50000, 100), (50000, 250000, 10000), (50000, 250000, 1000000)):
+		graph = [[] for i in range(n)]
+		for j in range(m):
+			graph[random.randrange(n)].append((random.randrange(n), random.randint(1, c)))
+		print('%d nodes, %d edges, weights 1..%d' % (n, m, c))
+		results = []
+		for (name, make) in (('binary heap', PriorityQueueHeap.PriorityQueue),
+							 ('radix heap', PriorityQueue)):
+			start = time.time()
+			results.append(dijkstra(graph, 0, make()))
+			print('  %-12s %.3fs' % (name, time.time() - start))
+		assert results[0] == results[1]
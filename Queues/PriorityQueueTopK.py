@@ -0,0 +1,82 @@
+"""
+Bounded top-k (or bottom-k) selector built on the binary heap priority queue.
+The heap holds at most k entries with the worst kept entry at its root, so a
+new entry is compared once against the root: if it is not better it is
+dropped in O(1), otherwise it replaces the root with a single sift-down.
+Memory stays O(k) however long the stream.
+Operation           Running Time
+------------------------------------
+S.push(k, v)        O(1) if rejected, O(log k) otherwise
+S.enqueue(k, v)     same as push
+S.consume(pairs)    O(n) plus O(log k) per accepted pair
+S.results()         O(k log k)
+S.peek()            O(1)
+len(S)              O(1)
+
+"""
+
+import PriorityQueueHeap, itertools
+
+class TopK(PriorityQueueHeap.PriorityQueue):
+
+	#---------------------- nested Item class ----------------------
+	class _ReverseItem(PriorityQueueHeap.PriorityQueue._Item):
+		"""Item ordered by decreasing key, turning the min-heap into a max-heap."""
+		__slots__ = ()
+
+		def __lt__(self, other):
+			return other._key < self._key
+
+	#--------------------- public methods --------------------------
+	def __init__(self, k, largest=True):
+		"""Create a selector keeping the k largest keys (the k smallest if largest is False)."""
+		if k < 1:
+			raise ValueError('k must be positive')
+		PriorityQueueHeap.PriorityQueue.__init__(self)
+		self._k = k
+		self._largest = largest
+		if not largest:
+			self._Item = self._ReverseItem		# root is then the largest kept key
+
+	def push(self, key, value):
+		"""Offer a key-value pair; return True if it is kept among the best k."""
+		data = self._data
+		if len(data) < self._k:
+			PriorityQueueHeap.PriorityQueue.enqueue(self, key, value)
+			return True
+		worst = data[0]._key
+		if (worst < key) if self._largest else (key < worst):
+			data[0] = self._Item(key, value)	# replace the root, then one sift-down
+			self._downheap(0)
+			return True
+		return False
+
+	def enqueue(self, key, value):
+		"""Offer a key-value pair as push does, so the heap never exceeds k entries."""
+		self.push(key, value)
+
+	def consume(self, pairs, chunk_size=1024):
+		"""Offer every (k, v) pair of pairs, processed chunk_size at a time.
+		Once the selector is full, each chunk is first filtered against the
+		current worst kept key. Return the number of pairs kept at offer time."""
+		pairs = iter(pairs)
+		kept = 0
+		while True:
+			chunk = list(itertools.islice(pairs, chunk_size))
+			if not chunk:
+				return kept
+			if len(self._data) == self._k:
+				worst = self._data[0]._key
+				if self._largest:
+					chunk = [p for p in chunk if worst < p[0]]
+				else:
+					chunk = [p for p in chunk if p[0] < worst]
+			for (k, v) in chunk:
+				if self.push(k, v):
+					kept += 1
+
+	def results(self):
+		"""Return the kept (k, v) pairs, best first."""
+		pairs = [(item._key, item._value) for item in self._data]
+		pairs.sort(key=lambda p: p[0], reverse=self._largest)
+		return pairs
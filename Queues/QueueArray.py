@@ -1,12 +1,18 @@
 """
-FIFO queue implementation using a list as underlying storage
-Operation       Running Time
-----------------------------
-S.enqueue(e)    Amortized O(1)
-S.dequeue()     Amortized O(1)
-S.peek()        O(1)
-S.is_empty()    O(1)
-len(S)          O(1)
+FIFO queue implementation using a list as a circular buffer
+Operation            Running Time
+---------------------------------
+S.enqueue(e)         Amortized O(1)
+S.dequeue()          Amortized O(1)
+S.enqueue_many(es)   Amortized O(k), copied in at most two slices
+S.dequeue_many(k)    Amortized O(k), copied out in at most two slices
+S.peek()             O(1)
+S.is_empty()         O(1)
+len(S)               O(1)
+
+The buffer doubles when full and halves when less than a quarter full, with
+elements moved by slice copies. Given maxlen, the queue is bounded instead:
+the buffer is allocated once and enqueues beyond maxlen raise Full.
 
 """
 
@@ -14,11 +20,19 @@ class Empty(Exception):
     """Error attempting to access an element from an empty container."""
     pass
 
+class Full(Exception):
+    """Error attempting to add an element to a full bounded container."""
+    pass
+
 class Queue:
-    
-    def __init__(self):
-        """Creaet an empty queue."""
-        self._data = []
+
+    DEFAULT_CAPACITY = 10
+
+    def __init__(self, maxlen=None):
+        """Creaet an empty queue, holding at most maxlen elements if maxlen is given."""
+        self._maxlen = maxlen
+        cap = maxlen if maxlen is not None else Queue.DEFAULT_CAPACITY
+        self._data = [None] * max(cap, 1)
         self._size = 0
         self._front = 0
 
@@ -30,18 +44,47 @@ class Queue:
         """Return True if the queue is empty."""
         return self._size == 0
 
+    def is_full(self):
+        """Return True if the queue is bounded and holds maxlen elements."""
+        return self._maxlen is not None and self._size >= self._maxlen
+
     def peek(self):
-        """Return (but do not remove) the element at the front of the queue.        
+        """Return (but do not remove) the element at the front of the queue.
         Raise Empty exception if the queue is empty."""
         if self.is_empty():
             raise Empty('Queue is empty')
         return self._data[self._front]
 
     def enqueue(self, e):
-        """Add an element to the back of queue."""
-        self._data.append(e)
+        """Add an element to the back of queue.
+        Raise Full exception if the queue is bounded and full."""
+        if self.is_full():
+            raise Full('Queue is full')
+        if self._size == len(self._data):
+            self._resize(2 * len(self._data))
+        avail = (self._front + self._size) % len(self._data)
+        self._data[avail] = e
         self._size += 1
 
+    def enqueue_many(self, elements):
+        """Add all elements of an iterable to the back of the queue, in order.
+        Raise Full exception (adding nothing) if they do not fit a bounded queue."""
+        elements = list(elements)
+        k = len(elements)
+        if self._maxlen is not None and self._size + k > self._maxlen:
+            raise Full('Queue is full')
+        if self._size + k > len(self._data):
+            cap = len(self._data)
+            while cap < self._size + k:
+                cap *= 2
+            self._resize(cap)
+        cap = len(self._data)
+        avail = (self._front + self._size) % cap
+        first = min(k, cap - avail)
+        self._data[avail:avail + first] = elements[:first]
+        self._data[:k - first] = elements[first:]
+        self._size += k
+
     def dequeue(self):
         """Remove and return the first element of the queue
         Raise Empty exception if the queue is empty"""
@@ -49,18 +92,40 @@ class Queue:
             raise Empty('Queue is empty')
         value = self._data[self._front]
         self._data[self._front] = None
-        self._front = self._front + 1
+        self._front = (self._front + 1) % len(self._data)
         self._size -= 1
-
-        if 0 < self._size < len(self._data) // 4:
-            self._resize()
+        self._shrink()
         return value
 
-    def _resize(self):
-        """Resize to a new list of capacity > len(self)"""
-        new = []
-        for i in range(self._size):
-            new.append(self._data[self._front])
-            self._front += 1
+    def dequeue_many(self, k):
+        """Remove and return a list of the first (up to) k elements of the queue."""
+        k = max(0, min(k, self._size))
+        cap = len(self._data)
+        first = min(k, cap - self._front)
+        values = self._data[self._front:self._front + first]
+        self._data[self._front:self._front + first] = [None] * first
+        if k > first:
+            values.extend(self._data[:k - first])
+            self._data[:k - first] = [None] * (k - first)
+        self._front = (self._front + k) % cap
+        self._size -= k
+        self._shrink()
+        return values
+
+    def _shrink(self):
+        """Halve the buffer of an unbounded queue that is less than a quarter full."""
+        if self._maxlen is None and 0 < self._size < len(self._data) // 4 \
+                and len(self._data) // 2 >= Queue.DEFAULT_CAPACITY:
+            self._resize(len(self._data) // 2)
+
+    def _resize(self, cap):
+        """Resize to a new list of capacity >= len(self), copying slices"""
+        old = self._data
+        end = self._front + self._size
+        if end <= len(old):
+            new = old[self._front:end]
+        else:
+            new = old[self._front:] + old[:end - len(old)]
+        new.extend([None] * (cap - self._size))
         self._data = new
-        self._front = 0
\ No newline at end of file
+        self._front = 0
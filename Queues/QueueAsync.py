@@ -0,0 +1,117 @@
+"""
+Asyncio FIFO queue built on one of the repository's queue cores.
+Coroutines await put and get on asyncio conditions instead of polling, and a
+maxsize makes producers wait for room (backpressure). Producer threads outside
+the event loop use put_threadsafe, which blocks the calling thread until the
+element has been accepted by the loop.
+Operation              Running Time
+-----------------------------------
+await S.put(e)         O(1) plus waiting
+await S.get()          O(1) plus waiting
+await S.get_many(n)    O(n) plus waiting
+S.put_threadsafe(e)    O(1) plus a loop round trip
+S.is_empty()           O(1)
+len(S)                 O(1)
+
+"""
+
+import QueueLinked, asyncio
+
+class Empty(Exception):
+    """Error attempting to access an element from an empty container."""
+    pass
+
+class Full(Exception):
+    """Error attempting to add an element to a full bounded container."""
+    pass
+
+class Queue:
+
+	#--------------------- public methods -------------------
+	def __init__(self, maxsize=None, core=None, loop=None):
+		"""Create an empty queue holding at most maxsize elements (None = unbounded).
+		core is the underlying queue (a new QueueLinked.Queue by default). loop is
+		the event loop serving put_threadsafe; by default, the loop of the first
+		coroutine that uses the queue."""
+		self._core = core if core is not None else QueueLinked.Queue()
+		self._maxsize = maxsize
+		self._loop = loop
+		self._lock = asyncio.Lock()
+		self._not_empty = asyncio.Condition(self._lock)
+		self._not_full = asyncio.Condition(self._lock)
+
+	def __len__(self):
+		"""Return the number of elements in the queue."""
+		return len(self._core)
+
+	def is_empty(self):
+		"""Return True if the queue is empty."""
+		return self._core.is_empty()
+
+	async def put(self, e, timeout=None):
+		"""Add an element to the back of the queue, waiting for room if it is full.
+		Raise Full if timeout seconds pass without room becoming available."""
+		self._bind_loop()
+		async with self._not_full:
+			if not await self._wait(self._not_full, self._has_room, timeout):
+				raise Full('Queue is full')
+			self._core.enqueue(e)
+			self._not_empty.notify()
+
+	async def get(self, timeout=None):
+		"""Remove and return the first element, waiting for one if the queue is empty.
+		Raise Empty if timeout seconds pass without an element arriving."""
+		self._bind_loop()
+		async with self._not_empty:
+			if not await self._wait(self._not_empty, self._has_element, timeout):
+				raise Empty('Queue is empty')
+			value = self._core.dequeue()
+			self._not_full.notify()
+			return value
+
+	async def get_many(self, max_n, timeout=None):
+		"""Wait for at least one element (at most timeout seconds), then remove and
+		return a list of up to max_n elements; the list is empty on timeout."""
+		self._bind_loop()
+		async with self._not_empty:
+			if not await self._wait(self._not_empty, self._has_element, timeout):
+				return []
+			if hasattr(self._core, 'dequeue_many'):
+				values = self._core.dequeue_many(max_n)
+			else:
+				values = []
+				while len(values) < max_n and not self._core.is_empty():
+					values.append(self._core.dequeue())
+			self._not_full.notify_all()
+			return values
+
+	def put_threadsafe(self, e, timeout=None):
+		"""Add an element from a thread other than the event loop's, blocking that
+		thread while the queue is full. Raise Full on timeout."""
+		if self._loop is None:
+			raise RuntimeError('Queue is not bound to an event loop yet')
+		future = asyncio.run_coroutine_threadsafe(self.put(e, timeout), self._loop)
+		return future.result()
+
+	#--------------------- non public methods -------------------
+	def _bind_loop(self):
+		if self._loop is None:
+			self._loop = asyncio.get_running_loop()
+
+	def _has_room(self):
+		return self._maxsize is None or len(self._core) < self._maxsize
+
+	def _has_element(self):
+		return not self._core.is_empty()
+
+	async def _wait(self, condition, predicate, timeout):
+		"""Wait on condition (whose lock is held) until predicate holds.
+		Return False if it does not hold within timeout seconds."""
+		if timeout is None:
+			await condition.wait_for(predicate)
+			return True
+		try:
+			await asyncio.wait_for(condition.wait_for(predicate), timeout)
+		except asyncio.TimeoutError:
+			return predicate()
+		return True
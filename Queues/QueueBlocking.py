@@ -0,0 +1,96 @@
+"""
+Thread-safe blocking FIFO queue built on one of the repository's queue cores.
+Producers and consumers share a lock and wait on condition variables instead
+of polling is_empty(): a consumer sleeps until an element arrives, and with a
+maxsize a producer sleeps until there is room (backpressure). Waits accept a
+timeout after which Empty or Full is raised.
+Operation              Running Time
+-----------------------------------
+S.put(e)               O(1) plus waiting
+S.get()                O(1) plus waiting
+S.get_many(n)          O(n) plus waiting
+S.is_empty()           O(1)
+len(S)                 O(1)
+
+"""
+
+import QueueLinked, threading
+
+class Empty(Exception):
+    """Error attempting to access an element from an empty container."""
+    pass
+
+class Full(Exception):
+    """Error attempting to add an element to a full bounded container."""
+    pass
+
+class Queue:
+
+	#--------------------- public methods -------------------
+	def __init__(self, maxsize=None, core=None):
+		"""Create an empty queue holding at most maxsize elements (None = unbounded).
+		core is the underlying queue (a new QueueLinked.Queue by default)."""
+		self._core = core if core is not None else QueueLinked.Queue()
+		self._maxsize = maxsize
+		self._lock = threading.Lock()
+		self._not_empty = threading.Condition(self._lock)
+		self._not_full = threading.Condition(self._lock)
+
+	def __len__(self):
+		"""Return the number of elements in the queue."""
+		with self._lock:
+			return len(self._core)
+
+	def is_empty(self):
+		"""Return True if the queue is empty."""
+		return len(self) == 0
+
+	def put(self, e, block=True, timeout=None):
+		"""Add an element to the back of the queue, waiting for room if it is full.
+		Raise Full if block is False and the queue is full, or if timeout
+		seconds pass without room becoming available."""
+		with self._not_full:
+			if not self._wait(self._not_full, self._has_room, block, timeout):
+				raise Full('Queue is full')
+			self._core.enqueue(e)
+			self._not_empty.notify()
+
+	def get(self, block=True, timeout=None):
+		"""Remove and return the first element, waiting for one if the queue is empty.
+		Raise Empty if block is False and the queue is empty, or if timeout
+		seconds pass without an element arriving."""
+		with self._not_empty:
+			if not self._wait(self._not_empty, self._has_element, block, timeout):
+				raise Empty('Queue is empty')
+			value = self._core.dequeue()
+			self._not_full.notify()
+			return value
+
+	def get_many(self, max_n, timeout=None):
+		"""Wait for at least one element (at most timeout seconds), then remove and
+		return a list of up to max_n elements; the list is empty on timeout."""
+		with self._not_empty:
+			if not self._wait(self._not_empty, self._has_element, True, timeout):
+				return []
+			if hasattr(self._core, 'dequeue_many'):
+				values = self._core.dequeue_many(max_n)
+			else:
+				values = []
+				while len(values) < max_n and not self._core.is_empty():
+					values.append(self._core.dequeue())
+			self._not_full.notify_all()
+			return values
+
+	#--------------------- non public methods -------------------
+	def _has_room(self):
+		return self._maxsize is None or len(self._core) < self._maxsize
+
+	def _has_element(self):
+		return not self._core.is_empty()
+
+	def _wait(self, condition, predicate, block, timeout):
+		"""Wait on condition (whose lock is held) until predicate holds.
+		Return False if it does not hold without blocking or within timeout."""
+		if not block:
+			return predicate()
+		return condition.wait_for(predicate, timeout)
@@ -4,12 +4,16 @@ FIFO queue implementation using a singly linked list for storage.
 Operation       Running Time
 ----------------------------
 S.enqueue(e)    O(1)
+S.enqueue_many(es)  O(k)
 S.dequeue()     O(1)
 S.peek()        O(1)
 S.is_empty()    O(1)
 len(S)          O(1)
 * require more space than an array implementation
 
+Queues may share a NodePool that recycles the nodes of dequeued elements
+instead of leaving them to the garbage collector (not thread-safe).
+
 """
 
 class Empty(Exception):
@@ -28,11 +32,12 @@ class Queue:
 			self._next = next
 
 	#--------------------- public methods -------------------
-	def __init__(self):
-		"""Create an empty queue."""
+	def __init__(self, pool=None):
+		"""Create an empty queue, taking nodes from NodePool pool if given."""
 		self._head = None
 		self._tail = None
 		self._size = 0
+		self._pool = pool
 
 	def __len__(self):
 		"""Return the number of elements in the queue."""
@@ -50,7 +55,10 @@ class Queue:
 
 	def enqueue(self, e):
 		"""Add an element to the back of queue."""
-		newest = self._Node(e, None)
+		if self._pool is None:
+			newest = self._Node(e, None)
+		else:
+			newest = self._pool._acquire(e, None)
 		if self.is_empty():
 			self._head = newest
 		else:
@@ -58,15 +66,87 @@ class Queue:
 		self._tail = newest
 		self._size += 1
 
+	def enqueue_many(self, elements):
+		"""Add all elements of an iterable to the back of the queue, in order.
+		The new nodes are chained first and linked behind the tail in one step."""
+		first = last = None
+		k = 0
+		for e in elements:
+			if self._pool is None:
+				node = self._Node(e, None)
+			else:
+				node = self._pool._acquire(e, None)
+			if last is None:
+				first = node
+			else:
+				last._next = node
+			last = node
+			k += 1
+		if k == 0:
+			return
+		if self.is_empty():
+			self._head = first
+		else:
+			self._tail._next = first
+		self._tail = last
+		self._size += k
+
 	def dequeue(self):
 		"""Remove and return the first element of the queue
 		Raise Empty exception if the queue is empty."""
 		if self.is_empty():
 			raise Empty('Queue is empty')
-		value = self._head._element
-		self._head = self._head._next
+		old = self._head
+		value = old._element
+		self._head = old._next
 		self._size -= 1
 		if self.is_empty():
 			self._tail = None
+		if self._pool is not None:
+			self._pool._release(old)
 		return value
 
+
+class NodePool:
+	"""Free list of recycled queue nodes, shareable by several Queues."""
+
+	def __init__(self, cap=1024):
+		"""Create an empty pool keeping at most cap spare nodes."""
+		self._free = None				# spare nodes, linked through _next
+		self._count = 0
+		self._cap = cap
+		self._reused = self._allocated = self._released = self._dropped = 0
+
+	def __len__(self):
+		"""Return the number of spare nodes in the pool."""
+		return self._count
+
+	def stats(self):
+		"""Return a dict of pool counters."""
+		return {'spare': self._count, 'cap': self._cap, 'reused': self._reused,
+				'allocated': self._allocated, 'released': self._released, 'dropped': self._dropped}
+
+	def _acquire(self, element, next):
+		"""Return a node holding element and next, recycled if one is spare."""
+		node = self._free
+		if node is None:
+			self._allocated += 1
+			return Queue._Node(element, next)
+		self._free = node._next
+		self._count -= 1
+		self._reused += 1
+		node._element = element
+		node._next = next
+		return node
+
+	def _release(self, node):
+		"""Take back a node that is no longer linked into any queue."""
+		node._element = None
+		if self._count < self._cap:
+			node._next = self._free
+			self._free = node
+			self._count += 1
+			self._released += 1
+		else:
+			node._next = None
+			self._dropped += 1
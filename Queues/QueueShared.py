@@ -0,0 +1,139 @@
+"""
+Cross-process FIFO queue stored in a multiprocessing.shared_memory ring buffer.
+Elements are pickled into length-prefixed records in a fixed-size byte ring.
+The producer owns the tail cursor and the consumer owns the head cursor;
+both are monotonically increasing byte counts, so neither side ever writes
+the other's cursor and one producer and one consumer need no lock at all.
+Several producers share a multiprocessing.Lock passed as lock. A record that
+does not fit before the end of the ring is preceded by a wrap marker (or by
+fewer than 4 spare bytes) and written at the start of the ring.
+Other processes attach with Queue(name=q.name, create=False).
+Operation       Running Time
+----------------------------
+S.enqueue(e)    O(m)    (m = pickled size of e)
+S.dequeue()     O(m)
+S.peek()        O(m)
+S.is_empty()    O(1)
+len(S)          O(1)
+
+"""
+
+from multiprocessing import shared_memory
+import pickle, struct
+
+class Empty(Exception):
+    """Error attempting to access an element from an empty container."""
+    pass
+
+class Full(Exception):
+    """Error attempting to add an element to a full bounded container."""
+    pass
+
+class Queue:
+
+	_HEADER = struct.Struct('<QQQQQ')	# capacity, head, tail, enqueued, dequeued
+	_CAP, _HEAD, _TAIL, _ENQ, _DEQ = 0, 8, 16, 24, 32		# field offsets in the header
+	_LEN = struct.Struct('<I')
+	_WRAP = 0xFFFFFFFF					# record length marking a jump to the ring start
+
+	#--------------------- public methods -------------------
+	def __init__(self, size=1 << 20, name=None, create=True, lock=None):
+		"""Create a queue with a ring of size bytes (or attach to the existing
+		segment called name if create is False). lock, if given, serializes
+		producers so that several processes may enqueue."""
+		if create:
+			self._shm = shared_memory.SharedMemory(name=name, create=True, size=Queue._HEADER.size + size)
+			Queue._HEADER.pack_into(self._shm.buf, 0, size, 0, 0, 0, 0)
+		else:
+			self._shm = shared_memory.SharedMemory(name=name)
+		self._buf = self._shm.buf
+		self._cap = self._read(Queue._CAP)
+		self._base = Queue._HEADER.size
+		self._lock = lock
+		self.name = self._shm.name
+
+	def __len__(self):
+		"""Return the number of elements in the queue."""
+		return self._read(Queue._ENQ) - self._read(Queue._DEQ)
+
+	def is_empty(self):
+		"""Return True if the queue is empty."""
+		return self._read(Queue._HEAD) == self._read(Queue._TAIL)
+
+	def peek(self):
+		"""Return (but do not remove) the element at the front of the queue.
+		Raise Empty exception if the queue is empty."""
+		start, stop = self._locate_front()
+		return pickle.loads(self._buf[start:stop])
+
+	def enqueue(self, e):
+		"""Add an element to the back of queue.
+		Raise Full exception if the ring has no room for it now, and ValueError
+		if its record is larger than half the ring."""
+		data = pickle.dumps(e, pickle.HIGHEST_PROTOCOL)
+		need = Queue._LEN.size + len(data)
+		if need > self._cap // 2:			# larger records may never fit around the wrap
+			raise ValueError('Element too large for the ring')
+		if self._lock is not None:
+			with self._lock:
+				self._enqueue_record(data, need)
+		else:
+			self._enqueue_record(data, need)
+
+	def dequeue(self):
+		"""Remove and return the first element of the queue
+		Raise Empty exception if the queue is empty."""
+		start, stop = self._locate_front()
+		value = pickle.loads(self._buf[start:stop])
+		self._write(Queue._DEQ, self._read(Queue._DEQ) + 1)
+		self._write(Queue._HEAD, self._head_after)		# publish last: frees the space
+		return value
+
+	def close(self):
+		"""Detach this process from the shared segment."""
+		self._buf = None
+		self._shm.close()
+
+	def unlink(self):
+		"""Destroy the shared segment (call once, from the creating process)."""
+		self._shm.unlink()
+
+	#--------------------- non public methods -------------------
+	def _read(self, offset):
+		return struct.unpack_from('<Q', self._buf, offset)[0]
+
+	def _write(self, offset, value):
+		struct.pack_into('<Q', self._buf, offset, value)
+
+	def _enqueue_record(self, data, need):
+		tail = self._read(Queue._TAIL)
+		pos = tail % self._cap
+		skip = 0
+		if self._cap - pos < need:			# record must start at the ring start
+			skip = self._cap - pos
+		if tail - self._read(Queue._HEAD) + skip + need > self._cap:
+			raise Full('Queue is full')
+		if skip >= Queue._LEN.size:
+			Queue._LEN.pack_into(self._buf, self._base + pos, Queue._WRAP)
+		pos = (pos + skip) % self._cap
+		at = self._base + pos
+		Queue._LEN.pack_into(self._buf, at, len(data))
+		self._buf[at + Queue._LEN.size:at + need] = data
+		self._write(Queue._ENQ, self._read(Queue._ENQ) + 1)
+		self._write(Queue._TAIL, tail + skip + need)		# publish last: makes it visible
+
+	def _locate_front(self):
+		"""Return the buffer slice bounds of the front record's payload and remember
+		the head cursor value that follows it. Raise Empty if there is none."""
+		head = self._read(Queue._HEAD)
+		if head == self._read(Queue._TAIL):
+			raise Empty('Queue is empty')
+		pos = head % self._cap
+		spare = self._cap - pos
+		if spare < Queue._LEN.size or Queue._LEN.unpack_from(self._buf, self._base + pos)[0] == Queue._WRAP:
+			head += spare
+			pos = 0
+		length = Queue._LEN.unpack_from(self._buf, self._base + pos)[0]
+		start = self._base + pos + Queue._LEN.size
+		self._head_after = head + Queue._LEN.size + length
+		return start, start + length
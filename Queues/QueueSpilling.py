@@ -0,0 +1,236 @@
+"""
+Durable FIFO queue whose backlog lives in append-only segment files on disk.
+Only a bounded head and tail are kept in memory: enqueued elements are pickled
+into a tail buffer that is appended to the current segment in one sequential
+write every tail_size elements, and dequeues are served from a head buffer of
+at most head_size elements read ahead from memory-mapped segments. A segment
+is closed once it reaches segment_size bytes and deleted once the read cursor
+has been checkpointed past it.
+Each record is a '<II' header (payload length, crc32) followed by the pickled
+element. The checkpoint file holds the (segment, offset) just after the last
+dequeued record; reopening a directory resumes from it, counts the records
+behind it and truncates a torn record left at the end of a segment by a crash.
+Elements dequeued since the last checkpoint are delivered again after a crash,
+and elements enqueued since the last flush() may be lost.
+Operation       Running Time
+----------------------------
+S.enqueue(e)    Amortized O(m)  (m = pickled size of e)
+S.dequeue()     Amortized O(m)
+S.peek()        Amortized O(m)
+S.is_empty()    O(1)
+len(S)          O(1)
+
+"""
+
+import QueueArray
+import mmap, os, pickle, struct, zlib
+
+class Empty(Exception):
+    """Error attempting to access an element from an empty container."""
+    pass
+
+class Queue:
+
+	_RECORD = struct.Struct('<II')			# payload length, crc32 of payload
+	_CURSOR = struct.Struct('<QQ')			# segment number, byte offset
+	_CHECKPOINT = 'checkpoint'
+
+	#--------------------- public methods -------------------
+	def __init__(self, directory, segment_size=64 << 20, head_size=1024, tail_size=1024, checkpoint_every=1024):
+		"""Open (or create) the queue stored in directory."""
+		os.makedirs(directory, exist_ok=True)
+		self._dir = directory
+		self._segment_size = segment_size
+		self._head_size = head_size
+		self._tail_size = tail_size
+		self._checkpoint_every = checkpoint_every
+		segments = self._segments()
+		cursor = self._load_checkpoint()
+		if cursor is None:
+			cursor = (segments[0] if segments else 0, 0)
+		for s in segments:
+			if s < cursor[0]:						# consumed before the last crash
+				os.remove(self._path(s))
+		segments = [s for s in segments if s >= cursor[0]]
+		if segments and segments[0] != cursor[0]:
+			cursor = (segments[0], 0)
+		elif segments:							# clamp to data that survived the crash
+			cursor = (cursor[0], min(cursor[1], os.path.getsize(self._path(cursor[0]))))
+		self._size = 0
+		for s in segments:
+			self._size += self._scan(s, cursor[1] if s == cursor[0] else 0)
+		self._oldest = cursor[0]
+		self._wseg = segments[-1] if segments else cursor[0]
+		self._wfile = open(self._path(self._wseg), 'ab', buffering=0)
+		self._wpos = self._wfile.tell()
+		self._synced = self._wpos					# bytes of the write segment known durable
+		self._pending = []							# tail buffer of encoded records
+		self._rseg, self._roff = cursor				# next record to read ahead
+		self._map = None
+		self._head = QueueArray.Queue()				# (element, cursor after it) pairs
+		self._done = cursor							# cursor after the last dequeued record
+		self._saved = cursor
+		self._since_checkpoint = 0
+
+	def __len__(self):
+		"""Return the number of elements in the queue."""
+		return self._size
+
+	def is_empty(self):
+		"""Return True if the queue is empty."""
+		return self._size == 0
+
+	def peek(self):
+		"""Return (but do not remove) the element at the front of the queue.
+		Raise Empty exception if the queue is empty."""
+		if self.is_empty():
+			raise Empty('Queue is empty')
+		if self._head.is_empty():
+			self._refill()
+		return self._head.peek()[0]
+
+	def enqueue(self, e):
+		"""Add an element to the back of queue."""
+		data = pickle.dumps(e, pickle.HIGHEST_PROTOCOL)
+		self._pending.append(Queue._RECORD.pack(len(data), zlib.crc32(data)) + data)
+		self._size += 1
+		if len(self._pending) >= self._tail_size:
+			self._write_pending()
+
+	def dequeue(self):
+		"""Remove and return the first element of the queue
+		Raise Empty exception if the queue is empty."""
+		if self.is_empty():
+			raise Empty('Queue is empty')
+		if self._head.is_empty():
+			self._refill()
+		value, self._done = self._head.dequeue()
+		self._size -= 1
+		self._since_checkpoint += 1
+		if self._done[0] != self._saved[0] or self._since_checkpoint >= self._checkpoint_every:
+			self.checkpoint()
+		return value
+
+	def flush(self):
+		"""Write the tail buffer to disk and fsync it, making every element
+		enqueued so far durable."""
+		self._write_pending()
+		os.fsync(self._wfile.fileno())
+		self._synced = self._wpos
+
+	def checkpoint(self):
+		"""Durably record the read cursor and delete fully consumed segments.
+		Records read back before their segment was synced are synced first,
+		so the recorded cursor never points past data lost in a crash."""
+		if self._done[0] == self._wseg and self._done[1] > self._synced:
+			os.fsync(self._wfile.fileno())
+			self._synced = self._wpos
+		tmp = os.path.join(self._dir, Queue._CHECKPOINT + '.tmp')
+		with open(tmp, 'wb') as f:
+			f.write(Queue._CURSOR.pack(*self._done))
+			f.flush()
+			os.fsync(f.fileno())
+		os.replace(tmp, os.path.join(self._dir, Queue._CHECKPOINT))
+		self._saved = self._done
+		self._since_checkpoint = 0
+		while self._oldest < self._saved[0]:
+			os.remove(self._path(self._oldest))
+			self._oldest += 1
+
+	def close(self):
+		"""Flush, checkpoint and release the files. Elements read ahead but not
+		dequeued remain on disk for the next open."""
+		self.flush()
+		self.checkpoint()
+		self._unmap()
+		self._wfile.close()
+
+	#--------------------- non public methods -------------------
+	def _path(self, segment):
+		return os.path.join(self._dir, '%020d.seg' % segment)
+
+	def _segments(self):
+		"""Return the sorted numbers of the segment files in the directory."""
+		return sorted(int(name[:-4]) for name in os.listdir(self._dir) if name.endswith('.seg'))
+
+	def _load_checkpoint(self):
+		try:
+			with open(os.path.join(self._dir, Queue._CHECKPOINT), 'rb') as f:
+				return Queue._CURSOR.unpack(f.read(Queue._CURSOR.size))
+		except (OSError, struct.error):
+			return None
+
+	def _scan(self, segment, offset):
+		"""Return the number of intact records of segment from offset on,
+		truncating the file at the first torn or corrupt record."""
+		path = self._path(segment)
+		end = os.path.getsize(path)
+		if end <= offset:
+			return 0
+		count = 0
+		with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+			while offset + Queue._RECORD.size <= end:
+				length, crc = Queue._RECORD.unpack_from(m, offset)
+				stop = offset + Queue._RECORD.size + length
+				if stop > end or zlib.crc32(m[offset + Queue._RECORD.size:stop]) != crc:
+					break
+				count += 1
+				offset = stop
+		if offset < end:
+			os.truncate(path, offset)
+		return count
+
+	def _write_pending(self):
+		"""Append the tail buffer to the current segment in one sequential write
+		(repeated while the unbuffered file accepts only part of it), first
+		starting a new segment if the current one is full."""
+		if not self._pending:
+			return
+		if self._wpos >= self._segment_size:
+			os.fsync(self._wfile.fileno())
+			self._wfile.close()
+			self._wseg += 1
+			self._wfile = open(self._path(self._wseg), 'ab', buffering=0)
+			self._wpos = self._synced = 0
+		data = memoryview(b''.join(self._pending))
+		while data:
+			written = self._wfile.write(data)
+			self._wpos += written
+			data = data[written:]
+		self._pending = []
+
+	def _refill(self):
+		"""Read up to head_size records ahead into the head buffer (the queue must not be empty).
+		Raise IOError if the segment files hold fewer records than expected."""
+		while len(self._head) < self._head_size and len(self._head) < self._size:
+			record = self._read_record()
+			if record is not None:
+				self._head.enqueue(record)
+			elif self._rseg < self._wseg:				# segment exhausted: move to the next
+				self._unmap()
+				self._rseg += 1
+				self._roff = 0
+			elif self._pending:							# caught up with the tail buffer
+				self._write_pending()
+			else:
+				raise IOError('Segment ' + repr(self._path(self._rseg)) + ' ends before the queue does')
+
+	def _read_record(self):
+		"""Return (element, cursor after it) for the record at the read cursor
+		and advance the cursor, or None if the segment has no further record."""
+		need = self._roff + Queue._RECORD.size
+		if self._map is None or len(self._map) < need:
+			self._unmap()
+			path = self._path(self._rseg)
+			if os.path.getsize(path) < need:
+				return None
+			with open(path, 'rb') as f:
+				self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		length = Queue._RECORD.unpack_from(self._map, self._roff)[0]
+		self._roff = need + length
+		return (pickle.loads(self._map[need:self._roff]), (self._rseg, self._roff))
+
+	def _unmap(self):
+		if self._map is not None:
+			self._map.close()
+			self._map = None
@@ -3,12 +3,16 @@ LIFO Stack implementation using a singly linked list for storage.
 Operation       Running Time
 ----------------------------
 S.push(e)      	O(1)
+S.push_many(es) O(k)
 S.pop()         O(1)
 S.peek()        O(1)
 S.is_empty()    O(1)
 len(S)          O(1)
 * require more space than an array implementation
 
+Stacks may share a NodePool that recycles the nodes of popped elements
+instead of leaving them to the garbage collector (not thread-safe).
+
 """
 
 class Empty(Exception):
@@ -27,10 +31,11 @@ class Stack:
 			self._next = next
 
 	#------------------- public methods -------------------
-	def __init__(self):
-		"""Create an empty stack."""
+	def __init__(self, pool=None):
+		"""Create an empty stack, taking nodes from NodePool pool if given."""
 		self._head = None
 		self._size = 0
+		self._pool = pool
 
 	def __len__(self):
 		"""Return the number of elements in the stack."""
@@ -49,17 +54,82 @@ class Stack:
 
 	def push(self, e):
 		"""Add element to the top of the stack."""
-		self._head = self._Node(e, self._head)
+		if self._pool is None:
+			self._head = self._Node(e, self._head)
+		else:
+			self._head = self._pool._acquire(e, self._head)
 		self._size += 1
 
+	def push_many(self, elements):
+		"""Push all elements of an iterable, in order; the last ends up on top.
+		The new nodes are chained off the current top and linked in one step."""
+		head = self._head
+		k = 0
+		for e in elements:
+			if self._pool is None:
+				head = self._Node(e, head)
+			else:
+				head = self._pool._acquire(e, head)
+			k += 1
+		self._head = head
+		self._size += k
+
 	def pop(self):
 		"""Remove and return the element from the top of the stack.
 		Raise Empty exception if the stack is empty."""
 		if self.is_empty():
 			raise Empty('stack is empty')
-		value = self._head._element
-		self._head = self._head._next
+		old = self._head
+		value = old._element
+		self._head = old._next
 		self._size -= 1
+		if self._pool is not None:
+			self._pool._release(old)
 		return value
 
 
+class NodePool:
+	"""Free list of recycled stack nodes, shareable by several Stacks."""
+
+	def __init__(self, cap=1024):
+		"""Create an empty pool keeping at most cap spare nodes."""
+		self._free = None				# spare nodes, linked through _next
+		self._count = 0
+		self._cap = cap
+		self._reused = self._allocated = self._released = self._dropped = 0
+
+	def __len__(self):
+		"""Return the number of spare nodes in the pool."""
+		return self._count
+
+	def stats(self):
+		"""Return a dict of pool counters."""
+		return {'spare': self._count, 'cap': self._cap, 'reused': self._reused,
+				'allocated': self._allocated, 'released': self._released, 'dropped': self._dropped}
+
+	def _acquire(self, element, next):
+		"""Return a node holding element and next, recycled if one is spare."""
+		node = self._free
+		if node is None:
+			self._allocated += 1
+			return Stack._Node(element, next)
+		self._free = node._next
+		self._count -= 1
+		self._reused += 1
+		node._element = element
+		node._next = next
+		return node
+
+	def _release(self, node):
+		"""Take back a node that is no longer linked into any stack."""
+		node._element = None
+		if self._count < self._cap:
+			node._next = self._free
+			self._free = node
+			self._count += 1
+			self._released += 1
+		else:
+			node._next = None
+			self._dropped += 1
+
+
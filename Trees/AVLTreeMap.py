@@ -0,0 +1,342 @@
+"""
+Sorted map implemented with an AVL tree on top of the linked binary tree.
+Every node records the height of its subtree; after an insert or delete the
+path to the root is walked and trinode restructurings (rotations) restore
+the height-balance property. Nodes also record their subtree size, which
+answers rank and select queries.
+Operation							Running Time
+--------------------------------------------------
+len(M)								O(1)
+k in M 								O(log n)
+M[k] = v 							O(log n)
+del M[K] 							O(log n)
+find_min, find_max					O(log n)
+find_gt, find_lt					O(log n)
+find_range							O(s + log n)
+rank, select, count_range			O(log n)
+iter(M), reversed(M)				O(n)
+
+"""
+
+from _collections_abc import MutableMapping		# the collections package here shadows the stdlib one
+import BinaryTree
+
+class Map(BinaryTree.Tree, MutableMapping):
+
+	#------------------- nested Item class ------------------------
+	class _Item:
+		"""Lightweight composite to store key-value pairs as map items."""
+		__slots__ = '_key', '_value'
+
+		def __init__(self, k, v):
+			self._key = k
+			self._value = v
+
+	#------------- nested Node class and Position wrapper -------------------
+	class _Node(BinaryTree.Tree._Node):
+		"""Node that also stores the height and size of its subtree (a leaf has height 1).
+		A new node starts at height 0 so that the first rebalance always updates it."""
+		__slots__ = '_height', '_size'
+		def __init__(self, element, parent=None, left=None, right=None):
+			BinaryTree.Tree._Node.__init__(self, element, parent, left, right)
+			self._height = 0
+			self._size = 1
+
+		def left_height(self):
+			return self._left._height if self._left is not None else 0
+
+		def right_height(self):
+			return self._right._height if self._right is not None else 0
+
+		def left_size(self):
+			return self._left._size if self._left is not None else 0
+
+		def right_size(self):
+			return self._right._size if self._right is not None else 0
+
+	class Position(BinaryTree.Tree.Position):
+		def key(self):
+			"""Return key of map's key-value pair."""
+			return self.element()._key
+
+		def value(self):
+			"""Return value of map's key-value pair."""
+			return self.element()._value
+
+
+	#------------------------- nonpublic utilities ------------------------
+	def _subtree_search(self, p, k):
+		"""Return Position of p's subtree having key k, or last node searched."""
+		node = p._node
+		while True:
+			key = node._element._key
+			if k == key:
+				break
+			child = node._left if k < key else node._right
+			if child is None:
+				break
+			node = child
+		return self._make_position(node)
+
+	def _subtree_first_position(self, p):
+		"""Return Position of first item in subtree rooted at p."""
+		walk = p._node
+		while walk._left is not None:
+			walk = walk._left
+		return self._make_position(walk)
+
+	def _subtree_last_position(self, p):
+		"""Return Position of last item in subtree rooted at p."""
+		walk = p._node
+		while walk._right is not None:
+			walk = walk._right
+		return self._make_position(walk)
+
+	def _pair(self, p):
+		"""Return the (key, value) tuple at Position p, or None if p is None."""
+		return (p.key(), p.value()) if p is not None else None
+
+
+	#-------------------- public navigation methods ------------------------
+	def first(self):
+		"""Return the first Position in the tree (or None if empty)."""
+		return self._subtree_first_position(self.root()) if len(self) > 0 else None
+
+	def last(self):
+		"""Return the last Position in the tree (or None if empty)."""
+		return self._subtree_last_position(self.root()) if len(self) > 0 else None
+
+	def before(self, p):
+		"""Return the Position just before p in the natural order.
+		Return None if p is the first position."""
+		self._validate(p)
+		if self.left(p):
+			return self._subtree_last_position(self.left(p))
+		walk = p
+		above = self.parent(walk)
+		while above is not None and walk == self.left(above):
+			walk = above
+			above = self.parent(walk)
+		return above
+
+	def after(self, p):
+		"""Return the Position just after p in the natural order.
+		Return None if p is the last position."""
+		self._validate(p)
+		if self.right(p):
+			return self._subtree_first_position(self.right(p))
+		walk = p
+		above = self.parent(walk)
+		while above is not None and walk == self.right(above):
+			walk = above
+			above = self.parent(walk)
+		return above
+
+	def find_position(self, k):
+		"""Return position with key k, or else neighbor (or None if empty)."""
+		if self.is_empty():
+			return None
+		return self._subtree_search(self.root(), k)
+
+	def delete(self, p):
+		"""Remove the item at given Position."""
+		self._validate(p)
+		if self.left(p) and self.right(p):
+			replacement = self._subtree_last_position(self.left(p))
+			self._replace(p, replacement.element())
+			p = replacement
+		parent = self.parent(p)
+		self._delete(p)
+		self._rebalance(parent)
+
+
+	#----------------------- map methods -----------------------------
+	def __getitem__(self, k):
+		"""Return value associated with key k (raise KeyError if not found)."""
+		p = self.find_position(k)
+		if p is None or p.key() != k:
+			raise KeyError('Key Error: ' + repr(k))
+		return p.value()
+
+	def __setitem__(self, k, v):
+		"""Assign value v to key k, overwriting existing value if present."""
+		if self.is_empty():
+			self._add_root(self._Item(k, v))
+			return
+		p = self._subtree_search(self.root(), k)
+		if p.key() == k:
+			p.element()._value = v
+			return
+		item = self._Item(k, v)
+		if p.key() < k:
+			leaf = self._add_right(p, item)
+		else:
+			leaf = self._add_left(p, item)
+		self._rebalance(leaf)
+
+	def __delitem__(self, k):
+		"""Remove item associated with key k (raise KeyError if not found)."""
+		p = self.find_position(k)
+		if p is None or p.key() != k:
+			raise KeyError('Key Error: ' + repr(k))
+		self.delete(p)
+
+	def __iter__(self):
+		"""Generate keys of the map ordered from minimum to maximum."""
+		p = self.first()
+		while p is not None:
+			yield p.key()
+			p = self.after(p)
+
+	def __reversed__(self):
+		"""Generate keys of the map ordered from maximum to minimum."""
+		p = self.last()
+		while p is not None:
+			yield p.key()
+			p = self.before(p)
+
+	#----------------------- locating methods ------------------------
+	def find_min(self):
+		"""Return (key, value) pair with minimum key (or None if empty)."""
+		return self._pair(self.first())
+
+	def find_max(self):
+		"""Return (key, value) pair with maximum key (or None if empty)."""
+		return self._pair(self.last())
+
+	def find_lt(self, k):
+		"""Return (key, value) pair with greatest key less than k."""
+		p = self.find_position(k)
+		if p is not None and not p.key() < k:
+			p = self.before(p)
+		return self._pair(p)
+
+	def find_gt(self, k):
+		"""Return (key, value) pair with least key strictly greater than k."""
+		p = self.find_position(k)
+		if p is not None and not k < p.key():
+			p = self.after(p)
+		return self._pair(p)
+
+	def find_range(self, start, stop):
+		"""Iterate all (key, value) pairs such that start <= key < stop.
+		If start is None, iteration begins with minimum key of map.
+		if stop is None, iteration continues through the maximum key of map."""
+		if start is None:
+			p = self.first()
+		else:
+			p = self.find_position(start)
+			if p is not None and p.key() < start:
+				p = self.after(p)
+		while p is not None and (stop is None or p.key() < stop):
+			yield (p.key(), p.value())
+			p = self.after(p)
+
+
+	#--------------------- rotation and balancing ---------------------
+	def _relink(self, parent, child, make_left_child):
+		"""Relink parent node with child node (we allow child to be None)."""
+		if make_left_child:
+			parent._left = child
+		else:
+			parent._right = child
+		if child is not None:
+			child._parent = parent
+
+	def _rotate(self, p):
+		"""Rotate Position p above its parent."""
+		x = p._node
+		y = x._parent
+		z = y._parent
+		if z is None:
+			self._root = x
+			x._parent = None
+		else:
+			self._relink(z, x, y is z._left)
+		if x is y._left:
+			self._relink(y, x._right, True)
+			self._relink(x, y, False)
+		else:
+			self._relink(y, x._left, False)
+			self._relink(x, y, True)
+
+	def _restructure(self, x):
+		"""Perform trinode restructure of Position x with parent/grandparent.
+		Return the Position that becomes root of the restructured subtree."""
+		y = self.parent(x)
+		z = self.parent(y)
+		if (x == self.right(y)) == (y == self.right(z)):
+			self._rotate(y)
+			return y
+		else:
+			self._rotate(x)
+			self._rotate(x)
+			return x
+
+	def _recompute_height(self, p):
+		p._node._height = 1 + max(p._node.left_height(), p._node.right_height())
+		p._node._size = 1 + p._node.left_size() + p._node.right_size()
+
+	def _isbalanced(self, p):
+		return abs(p._node.left_height() - p._node.right_height()) <= 1
+
+	def _tall_child(self, p, favorleft=False):
+		if p._node.left_height() + (1 if favorleft else 0) > p._node.right_height():
+			return self.left(p)
+		else:
+			return self.right(p)
+
+	def _tall_grandchild(self, p):
+		child = self._tall_child(p)
+		alignment = (child == self.left(p))
+		return self._tall_child(child, alignment)
+
+	def _rebalance(self, p):
+		"""Restore balance on the path from Position p up to the root.
+		The walk always reaches the root, since every subtree size on the path changed."""
+		while p is not None:
+			if not self._isbalanced(p):
+				p = self._restructure(self._tall_grandchild(p))
+				self._recompute_height(self.left(p))
+				self._recompute_height(self.right(p))
+			self._recompute_height(p)
+			p = self.parent(p)
+
+
+	#------------------- order statistics ----------------------------
+	def rank(self, k):
+		"""Return the number of keys strictly less than k."""
+		count = 0
+		node = self._root
+		while node is not None:
+			if node._element._key < k:
+				count += node.left_size() + 1
+				node = node._right
+			else:
+				node = node._left
+		return count
+
+	def select(self, i):
+		"""Return (key, value) pair with the i-th smallest key (0-based).
+		Negative i counts from the maximum; raise IndexError if out of range."""
+		if i < 0:
+			i += len(self)
+		if not 0 <= i < len(self):
+			raise IndexError('Index out of range')
+		node = self._root
+		while True:
+			left = node.left_size()
+			if i < left:
+				node = node._left
+			elif i == left:
+				return (node._element._key, node._element._value)
+			else:
+				i -= left + 1
+				node = node._right
+
+	def count_range(self, start, stop):
+		"""Return the number of keys such that start <= key < stop.
+		None bounds are treated as in find_range."""
+		low = 0 if start is None else self.rank(start)
+		high = len(self) if stop is None else self.rank(stop)
+		return max(high - low, 0)
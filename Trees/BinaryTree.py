@@ -27,7 +27,7 @@ class Tree(AbstractBinaryTreeBase.Tree):
 			self._left = left
 			self._right = right
 
-	class Position(BinaryTreeBase.Tree.Position):
+	class Position(AbstractBinaryTreeBase.Tree.Position):
 		"""An wrapper abstraction representing the location of a single element."""
 		def __init__(self, container, node):
 			self._container = container